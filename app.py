@@ -1,20 +1,51 @@
+import atexit
 import sys
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import QApplication, QMainWindow
 
-from config import DEV_MODE, DB_PATH
-from ui.main_window import StoryArkivist
+from config import DEV_MODE, DB_PATH, DB_URI, DEV_SNAPSHOT
 from ui.widgets.theme_manager import theme_manager
 
 def main():
+    # Attributes Qt only honours before the application object exists; setting them
+    # up front avoids a re-layout pass once the first window is shown.
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    QApplication.setHighDpiScaleFactorRoundingPolicy(
+        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+    )
     app = QApplication(sys.argv)
 
+    # Warm the font database off the GUI thread; the theme's font lookup would
+    # otherwise enumerate system fonts synchronously before the first paint.
+    QThreadPool.globalInstance().start(QFontDatabase.families)
+
     # Pick default theme index if you want (0=Light, 1=Dark, 2=High Contrast, 3=Fluent)
     theme_manager.set_index(1)  # start in Dark
     theme_manager.apply(app, font_family="Inter", base_pt=10)
 
-    w = StoryArkivist(dev_mode=DEV_MODE, db_path=DB_PATH)
-    w.show()
-    sys.exit(app.exec())
+    # Paint an empty, themed shell right away; the main window module is imported
+    # and built on the first event-loop tick, then takes the shell's place.
+    shell = QMainWindow()
+    shell.setWindowTitle("StoryArkivist")
+    shell.resize(1200, 700)
+    shell.show()
+
+    windows = []
+
+    def _build_window():
+        from ui.main_window import StoryArkivist
+
+        w = StoryArkivist(dev_mode=DEV_MODE, db_path=DB_PATH, db_uri=DB_URI, db_snapshot=DEV_SNAPSHOT)
+        w.setGeometry(shell.geometry())
+        w.show()
+        shell.close()
+        if DEV_SNAPSHOT:
+            atexit.register(w.db.save_snapshot)
+        windows.append(w)  # keep a reference for the lifetime of the app
+
+    QTimer.singleShot(0, _build_window)
+    raise SystemExit(app.exec())
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,28 @@
 """
 Global configuration for StoryArkivist.
 """
+import os
+from typing import Final
 
-# Toggle development mode features
-DEV_MODE = True  # set to False to hide dev menu / use persistent DB
-# DEV_MODE = False
+# Named run profiles: (database URI, dev snapshot file or None).
+# Database paths are SQLite URI filenames, opened with uri=True.
+PROFILES: Final[dict[str, tuple[str, str | None]]] = {
+    "dev": ("file:arkivist_mem?mode=memory&cache=shared", "dev_snapshot.db"),  # shared in-memory DB for quick testing
+    "test": ("file:arkivist_test?mode=memory&cache=shared", None),  # throwaway in-memory DB
+    "prod": ("file:story_arkivist.db", None),
+}
 
-# Database path selection
-if DEV_MODE:
-    DB_PATH = ":memory:"  # In-memory DB for quick testing
-else:
-    DB_PATH = "story_arkivist.db"
+# ARKIVIST_PROFILE picks a profile explicitly; otherwise a plain `python app.py`
+# runs "dev" and `python -O app.py` runs "prod".
+PROFILE: Final[str] = os.environ.get("ARKIVIST_PROFILE") or ("dev" if __debug__ else "prod")
+if PROFILE not in PROFILES:
+    raise ValueError(f"Unknown ARKIVIST_PROFILE {PROFILE!r}; expected one of {sorted(PROFILES)}")
 
+# Development mode shows the dev menu and seeds demo data
+DEV_MODE: Final[bool] = PROFILE == "dev"
+
+DB_PATH: Final[str] = PROFILES[PROFILE][0]
+DB_URI: Final[bool] = True
+
+# Dev-only snapshot used to prime (and persist) the in-memory DB between launches
+DEV_SNAPSHOT: Final[str | None] = PROFILES[PROFILE][1]
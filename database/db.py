@@ -1,246 +1,468 @@
 from __future__ import annotations
 import sqlite3
 import hashlib
+import json
+import logging
+import re
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Sequence
 
 from utils.md import md_to_html
-from database.schema import ensure_schema
-from database.migrations import upgrade
+from database.schema import ensure_schema, LATEST_SCHEMA_VERSION
+from database.migrations import upgrade, get_user_version
 
-import shutil, time, os
+import atexit, functools, glob, time, os, queue, threading, weakref
 
-def _backup_db_file(path: str) -> None:
+log = logging.getLogger(__name__)
+
+def _backup_db_file(conn: sqlite3.Connection, path: str) -> None:
+    """
+    Snapshot the database behind `conn` into `path`.bak-<timestamp> with SQLite's
+    online backup API (consistent under WAL, unlike a raw file copy).
+    """
     ts = time.strftime("%Y%m%d-%H%M%S")
-    shutil.copy2(path, f"{path}.bak-{ts}")
+    final = f"{path}.bak-{ts}"
+    # write under a temporary name so an interrupted backup never looks complete
+    dst = sqlite3.connect(final + ".part")
+    try:
+        conn.backup(dst, pages=1024)
+    finally:
+        dst.close()
+    os.replace(final + ".part", final)
+    _prune_backups(path)
+
+# routine open-time backups: at most one per day, kept this many days
+_BACKUP_KEEP_DAYS = 7
+
+def _backups(path: str) -> list[str]:
+    """Finished `path`.bak-<timestamp> files, oldest first."""
+    return sorted(p for p in glob.glob(glob.escape(path) + ".bak-*") if not p.endswith(".part"))
+
+def _backup_due(path: str) -> bool:
+    """True unless a backup was already taken today."""
+    today = f"{path}.bak-{time.strftime('%Y%m%d')}"
+    return not any(p.startswith(today) for p in _backups(path))
+
+def _prune_backups(path: str, keep_days: int = _BACKUP_KEEP_DAYS) -> None:
+    """Delete backups older than `keep_days`, always sparing the newest one."""
+    cutoff = f"{path}.bak-{time.strftime('%Y%m%d', time.localtime(time.time() - keep_days * 86400))}"
+    for p in _backups(path)[:-1]:
+        if p < cutoff:
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+def _backup_db_file_async(target: str, uri: bool, path: str) -> threading.Thread:
+    """Run `_backup_db_file` on a daemon thread with its own source connection."""
+    def run():
+        src = sqlite3.connect(target, uri=uri)
+        try:
+            _backup_db_file(src, path)
+        except sqlite3.Error as e:
+            log.warning("background backup failed: %s", e)
+        finally:
+            src.close()
+    t = threading.Thread(target=run, name="db-backup", daemon=True)
+    t.start()
+    return t
+
+def _file_from_uri(uri: str) -> Optional[Path]:
+    """Filesystem path behind an SQLite `file:` URI, or None for in-memory databases."""
+    name, _, query = uri[len("file:"):].partition("?")
+    if not name or name == ":memory:" or "mode=memory" in query.split("&"):
+        return None
+    return Path(name)
+
+def _readonly_uri(target: str, uri: bool) -> str:
+    """`file:` URI opening the same database as (`target`, `uri`) with mode=ro."""
+    if uri:
+        name, _, query = target.partition("?")
+        params = [p for p in query.split("&") if p and not p.startswith("mode=")]
+    else:
+        name, params = Path(target).resolve().as_uri(), []
+    return name + "?" + "&".join(params + ["mode=ro"])
+
+def _dense_positions(row) -> tuple[int, bool]:
+    """(count, dense) from a COUNT(*), COUNT(DISTINCT position), MIN, MAX row;
+    dense means the positions are exactly 0..count-1."""
+    n, distinct, lo, hi = row
+    return n, n == 0 or (distinct == n and lo == 0 and hi == n - 1)
+
+# INSERT ... RETURNING and UPDATE ... FROM are used throughout; both need SQLite 3.35+
+_MIN_SQLITE = (3, 35, 0)
+if sqlite3.sqlite_version_info < _MIN_SQLITE:
+    raise ImportError(f"SQLite {'.'.join(map(str, _MIN_SQLITE))} or newer is required "
+                      f"(this Python links {sqlite3.sqlite_version})")
+
+# columns character_facet_update may set, and its single (cacheable) statement
+_FACET_COLS = ("facet_type", "label", "value", "note", "link_world_id",
+               "status", "priority", "due_chapter_id", "position", "is_primary")
+# what facet list readers return: the row's content, without bookkeeping timestamps
+_FACET_SELECT = "id, character_id, " + ", ".join(_FACET_COLS)
+_FACET_UPDATE_SQL = (
+    "UPDATE character_facets SET "
+    + ", ".join(f"{c}=CASE WHEN ? THEN ? ELSE {c} END" for c in _FACET_COLS)
+    + ", updated_at=CURRENT_TIMESTAMP WHERE id=?"
+)
+
+_WS_RE = re.compile(r"\s+")
+_DROP_CR = str.maketrans("", "", "\r")
 
 def _normalize_alias(s: str) -> str:
-    # Trim, lower, collapse newlines to space, and normalize internal spaces
-    s = (s or "").strip().lower().replace("\r", "").replace("\n", " ")
-    # collapse multiple spaces
-    s = " ".join(s.split())
-    return s
+    # Drop CRs, collapse any whitespace run (newlines included) to one space, trim, lower
+    return _WS_RE.sub(" ", (s or "").translate(_DROP_CR)).strip().lower()
 
 def _norm_for_hash(text: str) -> str:
     return (text or "").replace("\r\n","\n").strip()
 
+def _text_hash(s: str) -> str:
+    # 20-byte BLAKE2b: same 40-hex width as the SHA-1 hashes older rows carry, but faster
+    return hashlib.blake2b(s.encode("utf-8", "ignore"), digest_size=20).hexdigest()
+
 def _sha1(s: str) -> str:
+    # legacy text_hash format; only used to recognise unchanged text in old rows
     return hashlib.sha1(s.encode("utf-8", "ignore")).hexdigest()
 
+def _writes(fn):
+    """Run a Database mutator under the writer lock (see `Database._writing`)."""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with self._writing():
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+class _ReaderLease:
+    """A pooled reader connection held by one thread (see `Database._reader`)."""
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
 class Database:
-    def __init__(self, path: Path):
-        self.path = Path(path)
-        self.conn = sqlite3.connect(str(self.path))
+    def __init__(self, path: Path, *, uri: bool = False, snapshot: str | None = None):
+        # with uri=True, `path` is an SQLite URI ("file:name.db", "file:x?mode=memory&cache=shared")
+        self.path = (_file_from_uri(str(path)) or Path(":memory:")) if uri else Path(path)
+        self.in_memory = str(self.path) == ":memory:"
+        self.snapshot = snapshot
+        self.restored_from_snapshot = False
+        self._tx_depth = 0  # open `transaction()` blocks; mutators defer commits while > 0
+        # held by the thread running a mutator or a transaction() block on self.conn;
+        # _writer is that thread's ident (None when nobody writes)
+        self._write_lock = threading.RLock()
+        self._writer: Optional[int] = None
+        # world item id -> type / title; types never change, titles only via the
+        # rename/update helpers below, which evict their entry
+        self._world_type_cache: dict[int, Optional[str]] = {}
+        self._world_title_cache: dict[int, str] = {}
+        # project id -> project_meta(); category id -> name. Evicted by the project_*
+        # mutators and world_category_rename respectively
+        self._project_cache: dict[int, Mapping] = {}
+        self._category_name_cache: dict[int, str] = {}
+        # version id -> (text object last stored, its hash); autosave tends to hand the
+        # same str back, and holding the reference keeps the identity check sound
+        self._ver_text_cache: dict[int, tuple[str, str]] = {}
+        # chapter id -> active_version_id; only the Database methods below repoint it
+        self._active_ver_cache: dict[int, int] = {}
+        # (project id, kind) -> template labels, dropped by traits_seed; table name -> exists
+        # (the schema is settled once migrations have run)
+        self._facet_labels_cache: dict[tuple[int, str], list[str]] = {}
+        self._table_cache: dict[str, bool] = {}
+        # read-only connections for SELECT helpers (file databases only; see `_reader`)
+        self._target, self._uri = str(path), uri
+        self._readers = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_idle: queue.LifoQueue = queue.LifoQueue()  # released by finished threads
+        self._reader_lock = threading.Lock()
+        # one shared connection; background loaders may read through it too.
+        # The statement cache is keyed by SQL text, so the fixed query strings used
+        # throughout this class are parsed once and reused; 256 covers all of them.
+        self.conn = sqlite3.connect(str(path), uri=uri, check_same_thread=False,
+                                    cached_statements=256)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON;")
         self.conn.execute("PRAGMA journal_mode = WAL;")
         self.conn.execute("PRAGMA synchronous = NORMAL;")
-    
+        self.conn.execute("PRAGMA temp_store = MEMORY;")
+        self.conn.execute("PRAGMA busy_timeout = 5000;")       # wait out a concurrent writer instead of failing
+        self.conn.execute("PRAGMA wal_autocheckpoint = 2000;")  # fewer, larger checkpoints on small commits
+        if not self.in_memory:
+            # serve reads straight from the mapped file; keep the private page cache small
+            self.conn.execute("PRAGMA mmap_size = 1073741824;")  # 1 GiB
+            self.conn.execute("PRAGMA cache_size = -8192;")      # 8 MiB
+
+        # in-memory (dev) databases can be primed from a snapshot file in one page copy
+        if snapshot and self.in_memory and os.path.exists(snapshot):
+            src = sqlite3.connect(snapshot)
+            try:
+                src.backup(self.conn)
+            finally:
+                src.close()
+            self.restored_from_snapshot = True
+
         # schema init / migrations:
         # 1) Base schema (v1)
         ensure_schema(self.conn)
-        # 2) Migrations to latest
+        # 2) Migrations to latest. The backup only has to finish before a migration
+        #    touches the file; otherwise it runs off the startup path.
+        self._backup_thread = None
         if self.path.exists():
-            _backup_db_file(str(self.path))
+            if get_user_version(self.conn) != LATEST_SCHEMA_VERSION:
+                _backup_db_file(self.conn, str(self.path))
+            elif _backup_due(str(self.path)):
+                self._backup_thread = _backup_db_file_async(self._target, uri, str(self.path))
         upgrade(self.conn)
+        # aliases written without alias_norm (older builds, raw inserts) get the same
+        # normalization as every other alias; OR IGNORE leaves clashing ones unset
+        self.conn.create_function("normalize_alias", 1, _normalize_alias, deterministic=True)
+        self.conn.execute("UPDATE OR IGNORE world_aliases SET alias_norm=normalize_alias(alias) WHERE alias_norm IS NULL")
+        self.conn.commit()
+        # legacy databases keep chapter text in chapters.content; the schema is fixed from here on
+        self._chapters_has_content = any(
+            col["name"] == "content" for col in self.conn.execute("PRAGMA table_info(chapters)"))
+
+        # checkpoint and close on interpreter exit if the owner never calls close()
+        self._closed = False
+        atexit.register(self.close)
+
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Connection for SELECT-only helpers. On-disk databases lend each thread a
+        read-only connection from a pool, so reads run alongside a write on
+        `self.conn` (WAL); when the thread finishes, its connection goes back to
+        the pool for the next thread instead of being reopened.
+        The thread currently writing reads through `self.conn` while it holds
+        uncommitted changes, so it sees them; other threads keep their pooled
+        connection and only see committed rows. In-memory databases have just
+        `self.conn`.
+        """
+        if self.in_memory or (self._writer == threading.get_ident() and self.conn.in_transaction):
+            return self.conn
+        lease = getattr(self._readers, "lease", None)
+        if lease is None:
+            try:
+                rc = self._reader_idle.get_nowait()
+            except queue.Empty:
+                rc = self._open_reader()
+            lease = _ReaderLease(rc)
+            # the thread-local dies with its thread; hand the connection back then
+            weakref.finalize(lease, self._reader_idle.put, rc)
+            self._readers.lease = lease
+        return lease.conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        # mode=ro: the file is opened read-only, so a reader can never take the write lock
+        rc = sqlite3.connect(_readonly_uri(self._target, self._uri), uri=True,
+                             check_same_thread=False, cached_statements=256)
+        rc.row_factory = sqlite3.Row
+        rc.execute("PRAGMA query_only = ON;")
+        rc.execute("PRAGMA busy_timeout = 5000;")
+        rc.execute("PRAGMA temp_store = MEMORY;")            # ORDER BY scratch stays off disk
+        rc.execute("PRAGMA mmap_size = 1073741824;")
+        rc.execute("PRAGMA cache_size = -65536;")            # 64 MiB: reads land here
+        with self._reader_lock:
+            self._reader_conns.append(rc)
+        return rc
 
     # ---- Projects
     def project_quantity(self) -> int:
-        c = self.conn.cursor()
-        c.execute("SELECT COUNT(*) FROM projects WHERE COALESCE(deleted,0)=0")
-        return int(c.fetchone()[0] or 0)
+        row = self._reader().execute("SELECT COUNT(*) FROM projects WHERE COALESCE(deleted,0)=0").fetchone()
+        return int(row[0] or 0)
+
+    def project_any(self) -> bool:
+        """True if at least one live project exists (stops at the first row)."""
+        row = self._reader().execute("SELECT EXISTS(SELECT 1 FROM projects WHERE COALESCE(deleted,0)=0)").fetchone()
+        return bool(row[0])
 
     def project_first_active(self) -> Optional[int]:
-        c = self.conn.cursor()
-        c.execute("SELECT id FROM projects WHERE COALESCE(deleted,0)=0 ORDER BY created_at, id LIMIT 1")
-        r = c.fetchone()
+        r = self._reader().execute("SELECT id FROM projects WHERE COALESCE(deleted,0)=0 ORDER BY created_at, id LIMIT 1").fetchone()
         return int(r["id"]) if r else None
 
-    def project_meta(self, project_id: int) -> dict:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, name, import_dir, export_dir, description
-                    FROM projects WHERE id=?""", (project_id,))
-        r = c.fetchone()
-        return dict(r) if r else {}
+    def project_meta(self, project_id: int) -> Mapping:
+        """The cached row as a read-only mapping (empty if missing)."""
+        meta = self._project_cache.get(project_id)
+        if meta is None:
+            r = self._reader().execute("""SELECT id, name, import_dir, export_dir, description
+                        FROM projects WHERE id=?""", (project_id,)).fetchone()
+            if not r:
+                return MappingProxyType({})
+            meta = self._project_cache[project_id] = MappingProxyType(dict(r))
+        return meta
     
     def project_name(self, project_id: int) -> Optional[str]:
-        c = self.conn.cursor()
-        c.execute("SELECT name FROM projects WHERE id=?", (project_id,))
-        r = c.fetchone()
-        return r["name"] if r else None
+        return self.project_meta(project_id).get("name")
 
+    @_writes
     def project_update_meta(self, project_id: int, *, name: Optional[str]=None,
                             import_dir: Optional[str]=None, export_dir: Optional[str]=None,
                             description: Optional[str]=None) -> None:
-        c = self.conn.cursor()
-        c.execute("""UPDATE projects
+        self.conn.execute("""UPDATE projects
                      SET name=COALESCE(?, name),
                          import_dir=COALESCE(?, import_dir),
                          export_dir=COALESCE(?, export_dir),
                          description=COALESCE(?, description)
                      WHERE id=?""", (name, import_dir, export_dir, description, project_id))
-        self.conn.commit()
+        self._project_cache.pop(project_id, None)
+        self._commit()
+
+    @_writes
+    def project_set_meta(self, project_id: int, *, name: str, import_dir: Optional[str],
+                         export_dir: Optional[str], description: Optional[str]) -> None:
+        """Like project_update_meta, but None clears a field instead of keeping it."""
+        self.conn.execute("""UPDATE projects
+                     SET name=?, import_dir=?, export_dir=?, description=?, deleted=COALESCE(deleted,0)
+                     WHERE id=?""", (name, import_dir, export_dir, description, project_id))
+        self._project_cache.pop(project_id, None)
+        self._commit()
+
+    @_writes
+    def project_delete(self, project_id: int) -> None:
+        """Hard delete; only meant for projects without any content."""
+        self.conn.execute("DELETE FROM projects WHERE id=?", (project_id,))
+        self._project_cache.pop(project_id, None)
+        self._commit()
 
+    @_writes
     def project_create(self, name: str="Untitled Project") -> int:
         c = self.conn.cursor()
-        c.execute("INSERT INTO projects(name) VALUES (?)", (name,))
-        self.conn.commit()
-        return int(c.lastrowid)
+        new_id = self._insert(c, "INSERT INTO projects(name) VALUES (?)", (name,))
+        self._commit()
+        return new_id
 
+    @_writes
     def project_soft_delete(self, project_id: int) -> None:
         self.conn.execute("UPDATE projects SET deleted=1 WHERE id=?", (project_id,))
-        self.conn.commit()
+        self._commit()
 
     def project_deleted(self, project_id: int) -> bool:
-        c = self.conn.cursor()
-        c.execute("SELECT id FROM projects WHERE id=? AND COALESCE(deleted,0)=0", (project_id,))
-        return bool(c.fetchone())
+        row = self._reader().execute("SELECT id FROM projects WHERE id=? AND COALESCE(deleted,0)=0", (project_id,)).fetchone()
+        return bool(row)
 
     # ---- Books
     def book_list(self, project_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, name, position FROM books
-                     WHERE project_id=? ORDER BY position, id""", (project_id,))
-        return c.fetchall()
+        return self._reader().execute("""SELECT id, name, position FROM books
+                     WHERE project_id=? ORDER BY position, id""", (project_id,)).fetchall()
 
+    @_writes
     def book_create(self, project_id: int, name: str="New Book", position: int=0) -> int:
         c = self.conn.cursor()
-        c.execute("INSERT INTO books(project_id, name, position) VALUES (?,?,?)",
+        new_id = self._insert(c, "INSERT INTO books(project_id, name, position) VALUES (?,?,?)",
                   (project_id, name, position))
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
 
+    @_writes
     def book_rename(self, book_id: int, new_name: str) -> None:
         self.conn.execute("UPDATE books SET name=? WHERE id=?", (new_name, book_id))
-        self.conn.commit()
+        self._commit()
 
     # ---- Chapters
     def chapter(self, chapter_id: int) -> Optional[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("SELECT title FROM chapters WHERE id=?", (chapter_id,))
-        r = c.fetchone()
+        r = self._reader().execute("SELECT title FROM chapters WHERE id=?", (chapter_id,)).fetchone()
         return r["title"] if r else None
     
-    def chapter_meta(self, chapter_id: int) -> dict:
+    def chapter_meta(self, chapter_id: int) -> Optional[sqlite3.Row]:
         """
-        Returns chapters meta plus active version id/hash/length (no text).
+        Returns chapters meta plus active version id/hash/length (no text), or None.
         """
-        c = self.conn.cursor()
-        c.execute("""SELECT id, title, position, book_id, project_id, active_version_id
-                    FROM chapters WHERE id=?""", (chapter_id,))
-        ch = c.fetchone()
-        if not ch:
-            return {}
-
-        ver = None
-        text_hash = None
-        text_len = None
-        if ch["active_version_id"]:
-            c.execute("SELECT id, text_hash, LENGTH(text) AS text_len FROM chapter_versions WHERE id=?",
-                    (ch["active_version_id"],))
-            ver = c.fetchone()
-            if ver:
-                text_hash = ver["text_hash"]
-                text_len  = ver["text_len"]
-
-        return {
-            "id": ch["id"],
-            "title": ch["title"],
-            "position": ch["position"],
-            "book_id": ch["book_id"],
-            "project_id": ch["project_id"],
-            "active_version_id": ch["active_version_id"],
-            "text_hash": text_hash,
-            "text_len": text_len,
-        }
+        return self._reader().execute("""
+            SELECT ch.id, ch.title, ch.position, ch.book_id, ch.project_id, ch.active_version_id,
+                   cv.text_hash, LENGTH(cv.text) AS text_len
+            FROM chapters ch
+            LEFT JOIN chapter_versions cv ON cv.id = ch.active_version_id
+            WHERE ch.id=?""", (chapter_id,)).fetchone()
 
     def chapter_last_position_index(self, project_id: int, book_id: int) -> int:
-        c = self.conn.cursor()
-        c.execute("SELECT COALESCE(MAX(position), -1) FROM chapters WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0", (project_id, book_id))
-        last_pos_idx = c.fetchone()[0]
-        if last_pos_idx is None or last_pos_idx < 0:
-            return -1
-        return last_pos_idx
+        row = self._reader().execute("SELECT MAX(position) FROM chapters WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0", (project_id, book_id)).fetchone()
+        return -1 if row[0] is None or row[0] < 0 else row[0]
 
     def chapter_content(self, chapter_id: int, version_id: int | None = None) -> str | None:
         if version_id is None:
-            row = self.chapter_active_version_row(chapter_id)
-            return row["text"] if row else None
-        else:
-            return self.chapter_content_by_version(version_id)
+            version_id = self.get_active_version_id(chapter_id)
+            if version_id is None:
+                return None
+        return self.chapter_content_by_version(version_id)
         
     def chapter_content_render(self, chapter_id: int, version_id: int | None = None) -> str | None:
         if version_id is None:
-            row = self.chapter_active_version_row(chapter_id)
-            return row["content_render"] if row else None
-        else:
-            return self.chapter_content_render_by_version(version_id)
+            version_id = self.get_active_version_id(chapter_id)
+            if version_id is None:
+                return None
+        return self.chapter_content_render_by_version(version_id)
 
     def chapter_project_id(self, chapter_id: int) -> Optional[int]:
-        c = self.conn.cursor()
-        c.execute("SELECT project_id FROM chapters WHERE id=?", (chapter_id,))
-        r = c.fetchone()
+        r = self._reader().execute("SELECT project_id FROM chapters WHERE id=?", (chapter_id,)).fetchone()
         return int(r["project_id"]) if r else None
 
     def chapter_content_by_version(self, version_id: int) -> str | None:
-        c = self.conn.cursor()
-        c.execute("SELECT text FROM chapter_versions WHERE id=?", (version_id,))
-        row = c.fetchone()
+        row = self._reader().execute("SELECT text FROM chapter_versions WHERE id=?", (version_id,)).fetchone()
         return row["text"] if row else None
 
+    def chapter_content_range(self, version_id: int, offset: int, length: int) -> str | None:
+        """`length` characters of a version's text from `offset` (0-based), without
+        loading the rest; None if the version does not exist."""
+        row = self._reader().execute("SELECT substr(text, ?, ?) FROM chapter_versions WHERE id=?",
+                                     (offset + 1, length, version_id)).fetchone()
+        return row[0] if row else None
+
     def chapter_content_render_by_version(self, version_id: int) -> str | None:
-        c = self.conn.cursor()
-        c.execute("SELECT content_render FROM chapter_versions WHERE id=?", (version_id,))
-        row = c.fetchone()
+        row = self._reader().execute("SELECT content_render FROM chapter_versions WHERE id=?", (version_id,)).fetchone()
         return row["content_render"] if row else None
 
     def chapter_version_hash(self, version_id: int) -> str | None:
-        c = self.conn.cursor()
-        c.execute("SELECT text_hash FROM chapter_versions WHERE id=?", (version_id,))
-        r = c.fetchone()
+        r = self._reader().execute("SELECT text_hash FROM chapter_versions WHERE id=?", (version_id,)).fetchone()
         return r["text_hash"] if r else None
 
-    def chapter_list(self, project_id: int, book_id: int, fetchone: bool=False) -> list[sqlite3.Row] | sqlite3.Row | None:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, title, position, active_version_id
+    def chapter_list(self, project_id: int, book_id: int) -> list[sqlite3.Row]:
+        return self._reader().execute("""SELECT id, title, position, active_version_id
                     FROM chapters
                     WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0
-                    ORDER BY position, id""", (project_id, book_id))
-        return c.fetchone() if fetchone else c.fetchall()
+                    ORDER BY position, id""", (project_id, book_id)).fetchall()
+
+    def chapter_list_first(self, project_id: int, book_id: int) -> sqlite3.Row | None:
+        """First live chapter of (project_id, book_id) by position, or None."""
+        return self._reader().execute("""SELECT id, title, position, active_version_id
+                    FROM chapters
+                    WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0
+                    ORDER BY position, id LIMIT 1""", (project_id, book_id)).fetchone()
+
+    def chapter_ids(self, project_id: int, book_id: int) -> list[int]:
+        """Ordered ids of the live chapters in (project_id, book_id)."""
+        rows = self._reader().execute("""SELECT id FROM chapters
+                    WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0
+                    ORDER BY position, id""", (project_id, book_id)).fetchall()
+        return [int(r[0]) for r in rows]
 
     def chapter_list_with_vermeta(self, project_id: int, book_id: int):
-        c = self.conn.cursor()
-        c.execute("""
+        return self._reader().execute("""
             SELECT ch.id, ch.title, ch.position, ch.active_version_id,
                 cv.text_hash, LENGTH(cv.text) AS text_len
             FROM chapters ch
             LEFT JOIN chapter_versions cv ON cv.id = ch.active_version_id
             WHERE ch.project_id=? AND ch.book_id=? AND COALESCE(ch.deleted,0)=0
             ORDER BY ch.position, ch.id
-        """, (project_id, book_id))
-        return c.fetchall()
+        """, (project_id, book_id)).fetchall()
 
     def chapter_insert(self, project_id: int, book_id: int, position: int,
                     title: str, content_md: str) -> int:
         """
         Creates a chapter and immediately creates an active chapter_version carrying `content_md`.
         """
-        c = self.conn.cursor()
-        print("Insert chapter:", project_id, book_id, position, title)
-        # Note: no 'content' here anymore; keep title/position on chapters
-        c.execute("""
-            INSERT INTO chapters(project_id, book_id, title, position, updated_at)
-            VALUES (?,?,?,?,CURRENT_TIMESTAMP)
-        """, (project_id, book_id, title, position))
-        chap_id = int(c.lastrowid)
-
-        # Seed first version and mark active
-        print("insert content:", content_md)
-        ver_id = self.create_chapter_version(chap_id, content_md or "", make_active=None)
-        # seed FTS if present
-        self.chapters_fts_upsert(chap_id, title, content_md or "")
-
-        self.conn.commit()
+        with self.transaction():
+            c = self.conn.cursor()
+            # Note: no 'content' here anymore; keep title/position on chapters
+            chap_id = self._insert(c, """
+                INSERT INTO chapters(project_id, book_id, title, position, updated_at)
+                VALUES (?,?,?,?,CURRENT_TIMESTAMP)
+            """, (project_id, book_id, title, position))
+
+            # Seed first version and mark active
+            self.create_chapter_version(chap_id, content_md or "", make_active=None)
+            # seed FTS if present
+            self.chapters_fts_upsert(chap_id, title, content_md or "")
         return chap_id
 
     def chapter_update(self, chapter_id: int, *, title: Optional[str]=None,
@@ -259,84 +481,121 @@ class Database:
             _, changed = self.set_chapter_version_text(ver_id, content_md)
             # nothing else to do here; caller can decide whether to recompute refs/metrics
 
+    @_writes
     def chapter_soft_delete(self, chapter_id: int) -> None:
         self.conn.execute("UPDATE chapters SET deleted=1, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                           (chapter_id,))
-        self.conn.commit()
+        self._active_ver_cache.pop(chapter_id, None)
+        self._commit()
 
+    @_writes
     def chapter_undelete(self, chapter_id: int) -> None:
         self.conn.execute("UPDATE chapters SET deleted=0, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                           (chapter_id,))
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def chapter_compact_positions(self, project_id: int, book_id: int) -> None:
         """
         Rewrite chapter positions within (project_id, book_id) to 0..N-1,
         skipping soft-deleted chapters.
         """
-        rows = self.chapter_list(project_id, book_id)  # assumed to exclude deleted
-        for new_pos, row in enumerate(rows):
-            cid = row["id"]
-            self.conn.execute("UPDATE chapters SET position=? WHERE id=?", (new_pos, cid))
-        self.conn.commit()
+        # one statement; rows already at their index are left untouched
+        self.conn.execute("""
+            UPDATE chapters SET position = s.rn - 1
+            FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) AS rn
+                  FROM chapters
+                  WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0) AS s
+            WHERE chapters.id = s.id AND chapters.position IS NOT s.rn - 1
+        """, (project_id, book_id))
+        self._commit()
 
-    def _chapter_set_position_and_book(self, chapter_id: int, position: int, book_id: int) -> None:
-        c = self.conn.cursor()
-        c.execute("UPDATE chapters SET position=?, book_id=? WHERE id=?",
-                  (position, book_id, chapter_id))
-        self.conn.commit()
+    @_writes
+    def chapter_set_order(self, book_id: int, chapter_ids: list[int]) -> None:
+        """
+        Place `chapter_ids` in `book_id` at positions 0..N-1 with one statement;
+        json_each yields (key=index, value=id), and rows already in place are skipped.
+        """
+        self.conn.execute("""
+            UPDATE chapters SET position = j.key, book_id = ?
+            FROM json_each(?) AS j
+            WHERE chapters.id = j.value
+              AND (chapters.position IS NOT j.key OR chapters.book_id IS NOT ?)
+        """, (book_id, json.dumps([int(cid) for cid in chapter_ids]), book_id))
+        self._commit()
 
     def chapter_move_to_index(self, project_id: int, book_id: int,
                               chapter_id: int, insert_index: int) -> None:
-        rows = [r["id"] for r in self.chapter_list(project_id, book_id)]
-        if chapter_id in rows:
-            rows.remove(chapter_id)
-        insert_index = max(0, min(insert_index, len(rows)))
-        rows.insert(insert_index, chapter_id)
-        for pos, cid in enumerate(rows):
-            self._chapter_set_position_and_book(cid, pos, book_id)
-
+        with self.transaction():
+            c = self.conn.cursor()
+            cur = c.execute("""SELECT project_id, book_id, position FROM chapters
+                               WHERE id=? AND COALESCE(deleted,0)=0""", (chapter_id,)).fetchone()
+            c.execute("""SELECT COUNT(*), COUNT(DISTINCT position), MIN(position), MAX(position)
+                        FROM chapters
+                        WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0""",
+                      (project_id, book_id))
+            n, dense = _dense_positions(c.fetchone())
+            if cur and cur["project_id"] == project_id and dense:
+                # positions are 0..N-1: shift only the rows between the old and new slot
+                shift = """UPDATE chapters SET position = position + ?
+                           WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0
+                             AND position >= ? AND position <= ?"""
+                if cur["book_id"] == book_id:
+                    old, new = cur["position"], max(0, min(insert_index, n - 1))
+                    if new < old:
+                        c.execute(shift, (1, project_id, book_id, new, old - 1))
+                    elif new > old:
+                        c.execute(shift, (-1, project_id, book_id, old + 1, new))
+                else:
+                    new = max(0, min(insert_index, n))
+                    c.execute(shift, (1, project_id, book_id, new, n))
+                c.execute("UPDATE chapters SET position=?, book_id=? WHERE id=?",
+                          (new, book_id, chapter_id))
+                return
+            # gaps, ties or a move across projects: renumber the whole book in the
+            # same transaction, reading the ids off the writer connection
+            rows = [int(r[0]) for r in c.execute("""SELECT id FROM chapters
+                        WHERE project_id=? AND book_id=? AND COALESCE(deleted,0)=0 AND id<>?
+                        ORDER BY position, id""", (project_id, book_id, chapter_id))]
+            rows.insert(max(0, min(insert_index, len(rows))), chapter_id)
+            self.chapter_set_order(book_id, rows)
+
+    @_writes
     def chapter_position_gap(self, N: int, project_id: int, book_id: int, last_pos_idx: int):
         # === Open a gap so inserts are contiguous (no interleaving) ===
-        cur = self.conn.cursor()
-        # cur.execute("SELECT MAX(position) FROM chapters WHERE project_id=? AND book_id=?", (project_id, book_id))
-        # base_index = cur.fetchone()[0]
-        # print("base_index", base_index)
-        # base_index = cur.fetchone()[0] + 1
-        cur.execute("""
+        self.conn.execute("""
             UPDATE chapters
             SET position = position + ?
             WHERE project_id=? AND book_id=? AND position >= ? AND COALESCE(deleted,0)=0
         """, (N, project_id, book_id, last_pos_idx))
-        self.conn.commit()
+        self._commit()
 
     # ---- Chapter versions / outline ----
     # --- Active version accessors ----------------------------------------------
 
     def _next_version_number(self, chapter_id: int) -> int:
-        c = self.conn.cursor()
-        c.execute("SELECT COALESCE(MAX(version_number), -1) AS mx FROM chapter_versions WHERE chapter_id=?",
-                (chapter_id,))
-        mx = c.fetchone()["mx"]
+        row = self._reader().execute("SELECT COALESCE(MAX(version_number), -1) AS mx FROM chapter_versions WHERE chapter_id=?",
+                (chapter_id,)).fetchone()
+        mx = row["mx"]
         return int(mx) + 1
 
     def create_chapter_version(self, chapter_id: int, text: str,
                             make_active: bool | None = None) -> int:
         # make_active: True = force; False = never; None = only if no active yet
-        if make_active is None and not self.get_active_version_id(chapter_id):
-            make_active = True
-        vn = self._next_version_number(chapter_id)
-        norm = _norm_for_hash(text); h = _sha1(norm)
-        c = self.conn.cursor()
-        c.execute("""
-            INSERT INTO chapter_versions
-            (chapter_id, version_number, text, text_hash, text_updated_at, format_updated_at)
-            VALUES (?,?,?,?,CURRENT_TIMESTAMP,CURRENT_TIMESTAMP)
-        """, (chapter_id, vn, text, h))
-        ver_id = int(c.lastrowid)
-        if make_active:
-            c.execute("UPDATE chapters SET active_version_id=? WHERE id=?", (ver_id, chapter_id))
-        self.conn.commit()
+        norm = _norm_for_hash(text); h = _text_hash(norm)
+        # version number, insert and activation commit together
+        with self.transaction():
+            if make_active is None and not self.get_active_version_id(chapter_id):
+                make_active = True
+            vn = self._next_version_number(chapter_id)
+            ver_id = self._insert(self.conn, """
+                INSERT INTO chapter_versions
+                (chapter_id, version_number, text, text_hash, text_updated_at, format_updated_at)
+                VALUES (?,?,?,?,CURRENT_TIMESTAMP,CURRENT_TIMESTAMP)
+            """, (chapter_id, vn, text, h))
+            if make_active:
+                self.conn.execute("UPDATE chapters SET active_version_id=? WHERE id=?", (ver_id, chapter_id))
+                self._active_ver_cache[chapter_id] = ver_id
         return ver_id
 
     def chapter_version_create_and_activate(self, chapter_id: int, seed_from_version_id: int | None = None) -> int:
@@ -350,50 +609,64 @@ class Database:
         return self.create_chapter_version(chapter_id, seed, make_active=True)
 
     def list_chapter_versions(self, chapter_id: int):
-        c = self.conn.cursor()
-        c.execute("""
+        return self._reader().execute("""
             SELECT cv.id, cv.version_number, cv.text_hash, cv.text_updated_at, cv.format_updated_at,
                 CASE WHEN ch.active_version_id=cv.id THEN 1 ELSE 0 END AS is_active
             FROM chapter_versions cv
             JOIN chapters ch ON ch.id=cv.chapter_id
             WHERE cv.chapter_id=?
             ORDER BY cv.version_number ASC
-        """, (chapter_id,))
-        return c.fetchall()
+        """, (chapter_id,)).fetchall()
 
+    @_writes
     def set_chapter_version_world_refs(self, chapter_version_id: int, world_ids: list[int]) -> None:
-        c = self.conn.cursor()
-        c.execute("DELETE FROM chapter_version_world_refs WHERE chapter_version_id=?", (chapter_version_id,))
-        uniq = sorted(set(int(w) for w in world_ids))
-        c.executemany("""INSERT OR IGNORE INTO chapter_version_world_refs(chapter_version_id, world_item_id)
-                        VALUES (?,?)""", [(chapter_version_id, wid) for wid in uniq])
-        self.conn.commit()
+        self._set_world_refs("chapter_version_world_refs", "chapter_version_id", chapter_version_id, world_ids)
+        self._commit()
 
     def copy_version_refs_to_chapter(self, chapter_id: int, chapter_version_id: int) -> None:
-        c = self.conn.cursor()
-        c.execute("""SELECT world_item_id FROM chapter_version_world_refs
-                    WHERE chapter_version_id=?""", (chapter_version_id,))
-        ids = [r["world_item_id"] for r in c.fetchall()]
-        self.set_chapter_world_refs(chapter_id, ids)
-
+        # same diff as set_chapter_world_refs, with the version's refs as the source set
+        with self.transaction():
+            self.conn.execute("""DELETE FROM chapter_world_refs
+                        WHERE chapter_id=? AND world_item_id NOT IN
+                            (SELECT world_item_id FROM chapter_version_world_refs
+                             WHERE chapter_version_id=?)""", (chapter_id, chapter_version_id))
+            self.conn.execute("""INSERT OR IGNORE INTO chapter_world_refs(chapter_id, world_item_id)
+                        SELECT ?, world_item_id FROM chapter_version_world_refs
+                        WHERE chapter_version_id=?""", (chapter_id, chapter_version_id))
+
+    @_writes
     def ensure_active_version(self, chapter_id: int) -> int:
+        # not a single UPSERT on idx_chver_active: the chapter's pointer lives in
+        # chapters.active_version_id, and a new version needs its version_number
+        # and seed text first, so the cached lookup below covers the common case
         ver_id = self.get_active_version_id(chapter_id)
         if ver_id:
             return ver_id
-        # seed from legacy chapters.content if present
         c = self.conn.cursor()
-        c.execute("PRAGMA table_info(chapters)")
-        has_content = any(col["name"] == "content" for col in c.fetchall())
+        # a version flagged is_active but not yet pointed to by the chapter: adopt it
+        row = c.execute("""SELECT id FROM chapter_versions
+                           WHERE chapter_id=? AND is_active=1
+                           ORDER BY id LIMIT 1""", (chapter_id,)).fetchone()
+        if row:
+            c.execute("UPDATE chapters SET active_version_id=? WHERE id=?", (row["id"], chapter_id))
+            self._active_ver_cache[chapter_id] = int(row["id"])
+            self._commit()
+            return int(row["id"])
+        # seed from legacy chapters.content if present
         seed = ""
-        if has_content:
+        if self._chapters_has_content:
             c.execute("SELECT content FROM chapters WHERE id=?", (chapter_id,))
             row = c.fetchone()
             seed = row["content"] if row and row["content"] else ""
         return self.create_chapter_version(chapter_id, seed, make_active=True)
 
+    @_writes
     def set_chapter_version_text(self, chapter_version_id: int, text: str) -> tuple[str, bool]:
         """Returns (new_hash, changed:bool)."""
-        norm = _norm_for_hash(text); h = _sha1(norm)
+        cached = self._ver_text_cache.get(chapter_version_id)
+        if cached is not None and cached[0] is text:
+            return cached[1], False
+        norm = _norm_for_hash(text); h = _text_hash(norm)
         c = self.conn.cursor()
 
         # early-out if unchanged
@@ -402,13 +675,21 @@ class Database:
         if not row:
             return h, False
         if row["text_hash"] == h:
+            self._ver_text_cache[chapter_version_id] = (text, h)
+            return h, False
+        if row["text_hash"] == _sha1(norm):
+            # same text, hashed before the switch to BLAKE2b: just upgrade the stored hash
+            c.execute("UPDATE chapter_versions SET text_hash=? WHERE id=?", (h, chapter_version_id))
+            self._commit()
+            self._ver_text_cache[chapter_version_id] = (text, h)
             return h, False
 
         # update version text/hash
         c.execute("""UPDATE chapter_versions
                     SET text=?, text_hash=?, text_updated_at=CURRENT_TIMESTAMP
                     WHERE id=?""", (text, h, chapter_version_id))
-        self.conn.commit()
+        self._commit()
+        self._ver_text_cache[chapter_version_id] = (text, h)
 
         # if this version is active, refresh FTS
         chap_id = row["chapter_id"]
@@ -419,168 +700,200 @@ class Database:
 
         return h, True
 
+    @_writes
     def touch_chapter_version_format(self, chapter_version_id: int):
-        c = self.conn.cursor()
-        c.execute("""UPDATE chapter_versions
+        self.conn.execute("""UPDATE chapter_versions
                     SET format_updated_at=CURRENT_TIMESTAMP
                     WHERE id=?""", (chapter_version_id,))
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def set_active_chapter_version(self, chapter_id: int, version_id: int) -> None:
-        c = self.conn.cursor()
-        c.execute("UPDATE chapters SET active_version_id=? WHERE id=?", (version_id, chapter_id))
-        self.conn.commit()
+        self.conn.execute("UPDATE chapters SET active_version_id=? WHERE id=?", (version_id, chapter_id))
+        self._active_ver_cache[chapter_id] = version_id
+        self._commit()
         # keep chapter-level refs in sync with the chosen active
         self.copy_version_refs_to_chapter(chapter_id, version_id)
 
     def get_active_version_id(self, chapter_id: int) -> int | None:
-        c = self.conn.cursor()
-        c.execute("SELECT active_version_id FROM chapters WHERE id=?", (chapter_id,))
-        row = c.fetchone()
-        return int(row["active_version_id"]) if row and row["active_version_id"] else None
+        ver_id = self._active_ver_cache.get(chapter_id)
+        if ver_id is None:
+            row = self._reader().execute("SELECT active_version_id FROM chapters WHERE id=?", (chapter_id,)).fetchone()
+            if not row or not row["active_version_id"]:
+                return None
+            ver_id = self._active_ver_cache[chapter_id] = int(row["active_version_id"])
+        return ver_id
 
     def chapter_version_row(self, version_id: int):
-        c = self.conn.cursor()
-        c.execute("SELECT * FROM chapter_versions WHERE id=?", (version_id,))
-        return c.fetchone()
+        return self._reader().execute("SELECT * FROM chapter_versions WHERE id=?", (version_id,)).fetchone()
 
     def chapter_active_version_row(self, chapter_id: int):
-        c = self.conn.cursor()
-        c.execute("""
+        return self._reader().execute("""
             SELECT cv.*
             FROM chapter_versions cv
             JOIN chapters ch ON ch.id=cv.chapter_id
             WHERE cv.chapter_id=? AND cv.id = ch.active_version_id
             LIMIT 1
-        """, (chapter_id,))
-        return c.fetchone()
+        """, (chapter_id,)).fetchone()
 
 
+    @_writes
     def set_chapter_title(self, chapter_id: int, title: str):
-        c = self.conn.cursor()
-        c.execute("""UPDATE chapters SET title=?, updated_at=CURRENT_TIMESTAMP WHERE id=?""",
+        self.conn.execute("""UPDATE chapters SET title=?, updated_at=CURRENT_TIMESTAMP WHERE id=?""",
                 (title, chapter_id))
-        self.conn.commit()
+        self._commit()
 
     def chapter_active_text_and_hash(self, chapter_id: int) -> tuple[str, str | None, int | None]:
-        row = self.chapter_active_version_row(chapter_id)
+        # only the three columns needed; chapter_active_version_row also drags in content_render
+        row = self._reader().execute("""
+            SELECT cv.id, cv.text, cv.text_hash
+            FROM chapters ch
+            JOIN chapter_versions cv ON cv.id = ch.active_version_id AND cv.chapter_id = ch.id
+            WHERE ch.id=?""", (chapter_id,)).fetchone()
         if not row:
             return "", None, None
-        text      = row["text"] if "text" in row.keys() else ""
-        text_hash = row["text_hash"] if "text_hash" in row.keys() else None
-        ver_id    = row["id"] if "id" in row.keys() else None
-        return (text or "", text_hash, ver_id)
+        return (row["text"] or "", row["text_hash"], row["id"])
 
     def chapter_active_version_id(self, chapter_id: int) -> int:
-        c = self.conn.cursor()
-        c.execute("""SELECT id FROM chapter_versions
-                    WHERE chapter_id=? AND is_active=1
-                    ORDER BY id LIMIT 1""", (chapter_id,))
-        r = c.fetchone()
-        if r: return int(r["id"])
-        # Create one lazily if missing
-        c.execute("INSERT INTO chapter_versions(chapter_id, is_active) VALUES (?,1)", (chapter_id,))
-        self.conn.commit()
-        return int(c.lastrowid)
+        # kept for older callers; ensure_active_version is the one path (a cache hit
+        # when the chapter already has an active version)
+        return self.ensure_active_version(chapter_id)
 
     def outline_items_for_version(self, chver_id: int) -> list:
-        c = self.conn.cursor()
+        # roots first, then children grouped by parent; both queries walk
+        # idx_ol_items_ver_parent in order, so neither needs a sort
+        c = self._reader().cursor()
         c.execute("""SELECT id, parent_id, order_key, text, tags, notes
                     FROM outline_items
-                    WHERE chapter_version_id=?
-                    ORDER BY parent_id IS NOT NULL, order_key, id""", (chver_id,))
-        return c.fetchall()
+                    WHERE chapter_version_id=? AND parent_id IS NULL
+                    ORDER BY order_key, id""", (chver_id,))
+        rows = c.fetchall()
+        c.execute("""SELECT id, parent_id, order_key, text, tags, notes
+                    FROM outline_items
+                    WHERE chapter_version_id=? AND parent_id IS NOT NULL
+                    ORDER BY parent_id, order_key, id""", (chver_id,))
+        return rows + c.fetchall()
 
+    @_writes
     def outline_insert_item(self, chver_id: int, parent_id: int|None, order_key: float,
                             text: str, tags_json: str="[]", notes: str="") -> int:
         c = self.conn.cursor()
-        c.execute("""INSERT INTO outline_items(chapter_version_id, parent_id, order_key, text, tags, notes)
+        new_id = self._insert(c, """INSERT INTO outline_items(chapter_version_id, parent_id, order_key, text, tags, notes)
                     VALUES (?,?,?,?,?,?)""", (chver_id, parent_id, order_key, text, tags_json, notes))
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
 
+    @_writes
     def outline_update_text(self, item_id: int, text: str) -> None:
         self.conn.execute("""UPDATE outline_items
                             SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?""", (text, item_id))
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def outline_delete_items(self, item_ids: list[int]) -> None:
         if not item_ids: return
-        q = ",".join("?"*len(item_ids))
-        self.conn.execute(f"DELETE FROM outline_items WHERE id IN ({q})", item_ids)
-        self.conn.commit()
+        # one fixed statement (cacheable) whatever the number of ids
+        self.conn.execute("DELETE FROM outline_items WHERE id IN (SELECT value FROM json_each(?))",
+                          (json.dumps([int(i) for i in item_ids]),))
+        self._commit()
 
     # ---- World categories/items/aliases/links (examples)
     def world_categories(self, project_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, parent_id, name, position
+        return self._reader().execute("""SELECT id, parent_id, name, position
                      FROM world_categories
                      WHERE project_id=? AND COALESCE(deleted,0)=0
-                     ORDER BY COALESCE(position,0), name, id""", (project_id,))
-        return c.fetchall()
+                     ORDER BY COALESCE(position,0), name, id""", (project_id,)).fetchall()
     
     def world_categories_top_level(self, project_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, name
+        return self._reader().execute("""SELECT id, name
                      FROM world_categories
                      WHERE project_id=? AND COALESCE(deleted,0)=0 AND parent_id IS NULL
-                     ORDER BY position, id""", (project_id,))
-        return c.fetchall()
+                     ORDER BY position, id""", (project_id,)).fetchall()
 
     def world_categories_children(self, parent_id: int, project_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, name
+        return self._reader().execute("""SELECT id, name
                      FROM world_categories
                      WHERE project_id=? AND COALESCE(deleted,0)=0 AND parent_id=?
-                     ORDER BY position, id""", (project_id, parent_id))
-        return c.fetchall()
+                     ORDER BY position, id""", (project_id, parent_id)).fetchall()
     
+    def world_categories_all(self, project_id: int) -> list[sqlite3.Row]:
+        """
+        Return every live category of a project in sibling order. You can group/filter in Python.
+        """
+        return self._reader().execute("""SELECT id, parent_id, name
+                     FROM world_categories
+                     WHERE project_id=? AND COALESCE(deleted,0)=0
+                     ORDER BY position, id""", (project_id,)).fetchall()
+
     def world_categories_count(self, project_id: int) -> int:
-        c = self.conn.cursor()
-        c.execute("SELECT COUNT(*) FROM world_categories WHERE project_id=? AND COALESCE(deleted,0)=0", (project_id,))
-        return int(c.fetchone()[0] or 0)
+        row = self._reader().execute("SELECT COUNT(*) FROM world_categories WHERE project_id=? AND COALESCE(deleted,0)=0", (project_id,)).fetchone()
+        return int(row[0] or 0)
+
+    def world_categories_any(self, project_id: int) -> bool:
+        """True if the project has at least one live category (stops at the first row)."""
+        row = self._reader().execute("SELECT EXISTS(SELECT 1 FROM world_categories WHERE project_id=? AND COALESCE(deleted,0)=0)", (project_id,)).fetchone()
+        return bool(row[0])
     
+    @_writes
     def world_category_insert(self, project_id: int, parent_id: Optional[int], name: str, position: Optional[int]=0) -> int:
         c = self.conn.cursor()
-        c.execute("""INSERT INTO world_categories(project_id, parent_id, name, position)
+        new_id = self._insert(c, """INSERT INTO world_categories(project_id, parent_id, name, position)
                      VALUES (?,?,?,?)""",
                   (project_id, parent_id, name, position))
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
     
     def world_category_insert_top_level(self, project_id: int, name: str, position: Optional[int]=0) -> int:
         return self.world_category_insert(project_id, None, name, position)
     
     def world_category(self, category_id: int) -> Optional[str]:
-        c = self.conn.cursor()
-        c.execute("SELECT name FROM world_categories WHERE id=?", (category_id,))
-        r = c.fetchone()
-        return r["name"] if r else None
+        name = self._category_name_cache.get(category_id)
+        if name is None:
+            r = self._reader().execute("SELECT name FROM world_categories WHERE id=?", (category_id,)).fetchone()
+            if not r:
+                return None
+            name = self._category_name_cache[category_id] = r["name"]
+        return name
     
     def world_category_meta(self, category_id: int) -> Optional[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("SELECT id, parent_id, name, position FROM world_categories WHERE id=?", (category_id,))
-        return c.fetchone()
+        return self._reader().execute("SELECT id, parent_id, name, position FROM world_categories WHERE id=?", (category_id,)).fetchone()
     
+    @_writes
     def world_category_rename(self, category_id: int, new_name: str) -> None:
         self.conn.execute("UPDATE world_categories SET name=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                           (new_name, category_id))
-        self.conn.commit()
+        self._category_name_cache.pop(category_id, None)
+        self._commit()
 
+    @_writes
     def world_category_soft_delete(self, category_id: int) -> None:
         self.conn.execute("UPDATE world_categories SET deleted=1, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                           (category_id,))
-        self.conn.commit()
+        self._commit()
+
+    @_writes
+    def world_tree_set_order(self, categories: list[tuple[Optional[int], int, int]],
+                             items: list[tuple[Optional[int], int]]) -> None:
+        """
+        Persist the world tree's layout in one commit: `categories` holds
+        (parent_id, position, category_id), `items` holds (category_id, world_item_id).
+        """
+        self.conn.executemany("UPDATE world_categories SET parent_id=?, position=? WHERE id=?", categories)
+        self.conn.executemany("UPDATE world_items SET category_id=? WHERE id=?", items)
+        self._commit()
 
+    @_writes
     def traits_seed(self, project_id: int, data: dict) -> None:
-        rows = []
-        for facet_type, traits in data.items():
-            rows.extend([(project_id, facet_type, l, i) for i,l in enumerate(traits) ])
-        cur = self.conn.cursor()
-        cur.executemany("INSERT OR IGNORE INTO facet_templates(project_id,kind,label,position) VALUES(?,?,?,?)",
-            rows
+        # one statement over {kind: [label, ...]}: the outer json_each yields each kind,
+        # the inner one its labels, and the array index (l.key) is the position
+        self.conn.execute("""INSERT OR IGNORE INTO facet_templates(project_id,kind,label,position)
+                       SELECT ?, k.key, l.value, l.key
+                       FROM json_each(?) AS k, json_each(k.value) AS l""",
+            (project_id, json.dumps({kind: list(traits) for kind, traits in data.items()}))
         )
-        self.conn.commit()
+        for key in [k for k in self._facet_labels_cache if k[0] == project_id]:
+            del self._facet_labels_cache[key]
+        self._commit()
 
     def notes_tree_seed(self, project_id: int) -> None:
         """
@@ -588,8 +901,7 @@ class Database:
         already have any notes_nodes. This is only intended for demo /
         first-run projects.
         """
-        c = self.conn.cursor()
-        row = c.execute(
+        row = self.conn.execute(
             "SELECT id FROM notes_nodes WHERE project_id=? LIMIT 1",
             (project_id,),
         ).fetchone()
@@ -689,49 +1001,43 @@ class Database:
             content_md="# History & Timeline\n\nMajor eras, events, and turning points.",
         )
 
+    @_writes
     def alias_types_seed(self, project_id: int, aliases: Iterable[str] = ("nickname","pseudonym","title","alias")) -> None:
-        c = self.conn.cursor()
-        c.executemany("INSERT OR IGNORE INTO alias_types (project_id, name) VALUES (?, ?)", ((project_id, alias) for alias in aliases))
-        self.conn.commit()
+        self.conn.execute("INSERT OR IGNORE INTO alias_types (project_id, name) SELECT ?, value FROM json_each(?)",
+                  (project_id, json.dumps(list(aliases))))
+        self._commit()
 
     def alias_types_for_project(self, project_id:int) -> list[str]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT name FROM alias_types WHERE project_id=? ORDER BY name", (project_id,))
-        return [r[0] for r in cur.fetchall()]
+        rows = self._reader().execute("SELECT name FROM alias_types WHERE project_id=? ORDER BY name", (project_id,)).fetchall()
+        return [r[0] for r in rows]
 
+    @_writes
     def alias_type_upsert(self, project_id:int, name:str):
-        cur = self.conn.cursor()
-        cur.execute("INSERT OR IGNORE INTO alias_types(project_id,name) VALUES(?,?)", (project_id, name.strip()))
-        self.conn.commit()
+        self.conn.execute("INSERT OR IGNORE INTO alias_types(project_id,name) VALUES(?,?)", (project_id, name.strip()))
+        self._commit()
 
     def aliases_for_world_item(self, world_item_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("SELECT id, alias, alias_type, alias_norm FROM world_aliases WHERE world_item_id=? AND COALESCE(deleted,0)=0", (world_item_id,))
-        return c.fetchall()
+        return self._reader().execute("SELECT id, alias, alias_type, alias_norm FROM world_aliases WHERE world_item_id=? AND COALESCE(deleted,0)=0", (world_item_id,)).fetchall()
 
     def alias_id_by_alias(self, world_item_id: int, alias: str) -> Optional[int]:
         norm = _normalize_alias(alias)
-        c = self.conn.cursor()
-        c.execute("""
+        r = self._reader().execute("""
             SELECT id FROM world_aliases
             WHERE world_item_id=? AND alias_norm=? AND COALESCE(deleted,0)=0
             LIMIT 1
-        """, (world_item_id, norm))
-        r = c.fetchone()
+        """, (world_item_id, norm)).fetchone()
         return int(r["id"]) if r else None
 
     def alias_exists(self, world_item_id: int, alias: str) -> bool:
         norm = _normalize_alias(alias)
-        c = self.conn.cursor()
-        c.execute("""
+        row = self._reader().execute("""
             SELECT 1 FROM world_aliases
             WHERE world_item_id=? AND alias_norm=? AND COALESCE(deleted,0)=0
             LIMIT 1
-        """, (world_item_id, norm))
-        print("alias:", alias, "norm:", norm)
-        print([f'norm={r["alias_norm"]}' for r in self.aliases_for_world_item(world_item_id)])
-        return c.fetchone() is not None
+        """, (world_item_id, norm)).fetchone()
+        return row is not None
 
+    @_writes
     def alias_add(self, world_item_id: int, alias: str, alias_type: str,
                 *, status: str = "active", note: str | None = None, is_primary: int = 0) -> int:
         """
@@ -745,43 +1051,77 @@ class Database:
         if not alias:
             return
         norm = _normalize_alias(alias)
-        if self.alias_exists(world_item_id, alias):
-            alias_id = self.alias_id_by_alias(world_item_id, alias)
-            return alias_id  # silently ignore or raise
-        c = self.conn.cursor()
-        # avoid dup (active ones); allow same alias if previous was defunct
-        row = c.execute("""SELECT id FROM world_aliases
-                    WHERE world_item_id=? AND alias_norm=? AND COALESCE(deleted,0)=0 AND status='active'""",
-                (world_item_id, norm)).fetchone()
-        if row:
-            return row["id"]  # silently ignore
-
-        # insert new alias
-        c.execute("""
+        params = (world_item_id, alias, alias_type, norm, status, note, int(is_primary))
+        # One statement against idx_world_alias_unique: inserts a new alias or revives a
+        # soft-deleted one with the same norm; returns nothing if a live alias exists.
+        rows = self.conn.execute("""
             INSERT INTO world_aliases (world_item_id, alias, alias_type, alias_norm, status, note, is_primary, deleted)
             VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-        """, (world_item_id, alias, alias_type, norm, status, note, int(is_primary)))
-        self.conn.commit()
-        return int(c.lastrowid)
+            ON CONFLICT(world_item_id, alias_norm) DO UPDATE SET
+                alias=excluded.alias, alias_type=excluded.alias_type, status=excluded.status,
+                note=excluded.note, is_primary=excluded.is_primary, deleted=0
+            WHERE COALESCE(world_aliases.deleted,0)<>0
+            RETURNING id
+        """, params).fetchall()
+        self._commit()
+        if rows:
+            return int(rows[0][0])
+        return self.alias_id_by_alias(world_item_id, alias)  # silently ignore or raise
+
+    def _existing_alias_norms(self, world_item_id: int) -> set[str]:
+        rows = self._reader().execute("""SELECT alias_norm FROM world_aliases
+                    WHERE world_item_id=? AND COALESCE(deleted,0)=0""", (world_item_id,)).fetchall()
+        return {r[0] for r in rows}
 
     def alias_add_multiple(self, world_item_id: int, aliases: dict[str, str]) -> None:
-        c = self.conn.cursor()
-        c.executemany(
-            "INSERT INTO world_aliases (world_item_id, alias, alias_type, alias_norm) VALUES (?, ?, ?, ?)", 
-            ((world_item_id, alias, alias_type, _normalize_alias(alias)) for alias, alias_type in aliases.items())
-        )
-        self.conn.commit()
-
-    def alias_update(self, alias_id: int, alias: str, alias_type: str) -> None:
-        c = self.conn.cursor()
-        c.execute("UPDATE world_aliases SET alias=?, alias_type=? WHERE id=?", (alias, alias_type, alias_id))
-        self.conn.commit()
+        """
+        Insert several aliases at once, skipping any whose normalized form the
+        item already has (or that repeat within `aliases`).
+        """
+        new: dict[str, tuple[str, str]] = {}
+        for alias, alias_type in aliases.items():
+            alias = (alias or "").strip()
+            if alias:
+                new.setdefault(_normalize_alias(alias), (alias, alias_type))
+        for norm in self._existing_alias_norms(world_item_id):
+            new.pop(norm, None)
+        if not new:
+            return
+        with self.transaction():
+            # OR IGNORE: soft-deleted aliases still occupy idx_world_alias_unique.
+            # One fixed statement over a JSON list of [alias, type, norm] rows
+            self.conn.execute("""INSERT OR IGNORE INTO world_aliases (world_item_id, alias, alias_type, alias_norm)
+                        SELECT ?, json_extract(value, '$[0]'), json_extract(value, '$[1]'), json_extract(value, '$[2]')
+                        FROM json_each(?)""",
+                (world_item_id, json.dumps([[alias, alias_type, norm] for norm, (alias, alias_type) in new.items()])))
 
+    @_writes
+    def alias_update(self, alias_id: int, alias: str, alias_type: str) -> bool:
+        """
+        Rename/retype an alias, keeping alias_norm in step. Refused (False) if another
+        live alias of the item has the new normalized form; OR IGNORE also refuses a
+        soft-deleted one, which still holds idx_world_alias_unique.
+        """
+        alias = (alias or "").strip()
+        if not alias:
+            return False
+        norm = _normalize_alias(alias)
+        cur = self.conn.execute("""
+            UPDATE OR IGNORE world_aliases SET alias=?, alias_type=?, alias_norm=?
+            WHERE id=? AND NOT EXISTS (
+                SELECT 1 FROM world_aliases w2
+                WHERE w2.world_item_id=world_aliases.world_item_id AND w2.id<>world_aliases.id
+                  AND w2.alias_norm=? AND COALESCE(w2.deleted,0)=0)
+        """, (alias, alias_type, norm, alias_id, norm))
+        self._commit()
+        return cur.rowcount == 1
+
+    @_writes
     def alias_update_type(self, alias_id: int, alias_type: str) -> None:
-        c = self.conn.cursor()
-        c.execute("UPDATE world_aliases SET alias_type=? WHERE id=?", (alias_type, alias_id))
-        self.conn.commit()
+        self.conn.execute("UPDATE world_aliases SET alias_type=? WHERE id=?", (alias_type, alias_id))
+        self._commit()
 
+    @_writes
     def alias_set_primary(self, world_item_id: int, alias_id: int = None, alias_title: str = None) -> None:
         if alias_id is None and alias_title is not None:
             alias_id = self.alias_id_by_alias(world_item_id, alias_title)
@@ -790,40 +1130,31 @@ class Database:
         c.execute("UPDATE world_aliases SET is_primary=0 WHERE world_item_id=?", (world_item_id,))
         # set this one
         c.execute("UPDATE world_aliases SET is_primary=1 WHERE id=?", (alias_id,))
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def alias_update_alias(self, alias_id: int, alias: str) -> bool:
         alias = (alias or "").strip()
         if not alias:
             return False
         norm = _normalize_alias(alias)
-        # fetch world_item_id for dupe check
-        c = self.conn.cursor()
-        c.execute("SELECT world_item_id FROM world_aliases WHERE id=?", (alias_id,))
-        row = c.fetchone()
-        if not row:
-            return False
-        world_item_id = row[0]
-        if self.alias_exists(world_item_id, alias):
-            return False  # silently ignore or raise
-        # prevent dupes against other aliases
-        c.execute("""
-            SELECT 1 FROM world_aliases
-            WHERE world_item_id=? AND alias_norm=? AND id<>? AND COALESCE(deleted,0)=0
-            LIMIT 1
-        """, (world_item_id, norm, alias_id))
-        if c.fetchone():
-            return False
-
-        c.execute("UPDATE world_aliases SET alias=?, alias_norm=? WHERE id=?", (alias, norm, alias_id))
-        self.conn.commit()
-        return True
-
+        # refuse (rowcount 0) if the item already has a live alias with this
+        # normalized form, this one included
+        cur = self.conn.execute("""
+            UPDATE world_aliases SET alias=?, alias_norm=?
+            WHERE id=? AND NOT EXISTS (
+                SELECT 1 FROM world_aliases w2
+                WHERE w2.world_item_id=world_aliases.world_item_id
+                  AND w2.alias_norm=? AND COALESCE(w2.deleted,0)=0)
+        """, (alias, norm, alias_id, norm))
+        self._commit()
+        return cur.rowcount == 1
+
+    @_writes
     def alias_delete(self, alias_id: int) -> None:
         """Soft delete an alias."""
-        c = self.conn.cursor()
-        c.execute("UPDATE world_aliases SET deleted=1 WHERE id=?", (alias_id,))
-        self.conn.commit()
+        self.conn.execute("UPDATE world_aliases SET deleted=1 WHERE id=?", (alias_id,))
+        self._commit()
 
     # ---- Tags / classification ----
 
@@ -831,16 +1162,15 @@ class Database:
         """
         Return all tags defined for this project.
         """
-        c = self.conn.cursor()
-        c.execute(
+        return self._reader().execute(
             """SELECT id, project_id, name, description, visibility_default
                FROM entity_tags
                WHERE project_id=?
                ORDER BY lower(name), id""",
             (project_id,),
-        )
-        return c.fetchall()
+        ).fetchall()
 
+    @_writes
     def entity_tag_upsert(
         self,
         project_id: int,
@@ -869,23 +1199,22 @@ class Database:
                 "WHERE id=?",
                 (description, visibility_default, tag_id),
             )
-            self.conn.commit()
+            self._commit()
             return tag_id
 
-        c.execute(
+        new_id = self._insert(c,
             "INSERT INTO entity_tags(project_id, name, description, visibility_default) "
             "VALUES (?,?,?,?)",
             (project_id, name, description, visibility_default),
         )
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
 
     def world_item_tags_for_item(self, world_item_id: int) -> list[sqlite3.Row]:
         """
         Return all tags attached to a world item, with tag names/descriptions.
         """
-        c = self.conn.cursor()
-        c.execute(
+        return self._reader().execute(
             """SELECT wit.id,
                       wit.world_item_id,
                       wit.tag_id,
@@ -897,9 +1226,9 @@ class Database:
                WHERE wit.world_item_id=?
                ORDER BY et.name""",
             (world_item_id,),
-        )
-        return c.fetchall()
+        ).fetchall()
 
+    @_writes
     def world_item_tag_add(
         self,
         world_item_id: int,
@@ -918,23 +1247,23 @@ class Database:
         if row:
             return int(row["id"])
 
-        c.execute(
+        new_id = self._insert(c,
             "INSERT INTO world_item_tags(world_item_id, tag_id, source) VALUES (?,?,?)",
             (world_item_id, tag_id, source),
         )
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
 
+    @_writes
     def world_item_tag_remove(self, world_item_id: int, tag_id: int) -> None:
         """
         Remove a tag from a world item.
         """
-        c = self.conn.cursor()
-        c.execute(
+        self.conn.execute(
             "DELETE FROM world_item_tags WHERE world_item_id=? AND tag_id=?",
             (world_item_id, tag_id),
         )
-        self.conn.commit()
+        self._commit()
 
     # ---- Notes tree / world notes ----
 
@@ -942,19 +1271,17 @@ class Database:
         """
         Return all notes_nodes for a project. You can group/filter in Python.
         """
-        c = self.conn.cursor()
-        c.execute(
+        return self._reader().execute(
             "SELECT * FROM notes_nodes WHERE project_id=? "
             "ORDER BY parent_node_id, position, id",
             (project_id,),
-        )
-        return c.fetchall()
+        ).fetchall()
 
     def notes_children(self, project_id: int, parent_node_id: int | None) -> list[sqlite3.Row]:
         """
         Convenience helper: return children of a given parent (or root nodes if parent_node_id is None).
         """
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         if parent_node_id is None:
             c.execute(
                 "SELECT * FROM notes_nodes "
@@ -972,10 +1299,9 @@ class Database:
         return c.fetchall()
 
     def notes_node_get(self, node_id: int) -> sqlite3.Row | None:
-        c = self.conn.cursor()
-        c.execute("SELECT * FROM notes_nodes WHERE id=?", (node_id,))
-        return c.fetchone()
+        return self._reader().execute("SELECT * FROM notes_nodes WHERE id=?", (node_id,)).fetchone()
 
+    @_writes
     def notes_node_insert(
         self,
         project_id: int,
@@ -1013,7 +1339,7 @@ class Database:
                 ).fetchone()
             position = int(row[0] if row[0] is not None else 0)
 
-        c.execute(
+        new_id = self._insert(c,
             """INSERT INTO notes_nodes(
                    project_id,
                    parent_node_id,
@@ -1038,20 +1364,19 @@ class Database:
                 implied_facet_kind,
             ),
         )
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
 
     def notes_docs_for_node(self, node_id: int) -> list[sqlite3.Row]:
         """
         Return all tabs (notes_docs) for a node, ordered by position.
         """
-        c = self.conn.cursor()
-        c.execute(
+        return self._reader().execute(
             "SELECT * FROM notes_docs WHERE node_id=? ORDER BY position, id",
             (node_id,),
-        )
-        return c.fetchall()
+        ).fetchall()
 
+    @_writes
     def notes_doc_insert(
         self,
         node_id: int,
@@ -1081,41 +1406,38 @@ class Database:
         else:
             html = content_render
 
-        c.execute(
+        new_id = self._insert(c,
             "INSERT INTO notes_docs(node_id, title, position, content_md, content_render, visibility) "
             "VALUES (?,?,?,?,?,?)",
             (node_id, title, position, content_md, html, visibility),
         )
-        self.conn.commit()
-        return int(c.lastrowid)
+        self._commit()
+        return new_id
     
     def notes_doc_get(self, doc_id: int) -> sqlite3.Row | None:
-        c = self.conn.cursor()
-        c.execute("SELECT * FROM notes_docs WHERE id=?", (doc_id,))
-        return c.fetchone()
+        return self._reader().execute("SELECT * FROM notes_docs WHERE id=?", (doc_id,)).fetchone()
 
+    @_writes
     def notes_doc_update_content(self, doc_id: int, content_md: str) -> None:
         html = md_to_html(content_md or "", css=None, include_scaffold=False)
-        c = self.conn.cursor()
-        c.execute(
+        self.conn.execute(
             """UPDATE notes_docs
                SET content_md=?, content_render=?, updated_at=CURRENT_TIMESTAMP
                WHERE id=?""",
             (content_md, html, doc_id),
         )
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def notes_doc_delete(self, doc_id: int) -> None:
-        c = self.conn.cursor()
-        c.execute("DELETE FROM notes_docs WHERE id=?", (doc_id,))
-        self.conn.commit()
+        self.conn.execute("DELETE FROM notes_docs WHERE id=?", (doc_id,))
+        self._commit()
 
     def note_members_for_node(self, node_id: int) -> list[sqlite3.Row]:
         """
         Return all members for a membership node, joined with world item title/type.
         """
-        c = self.conn.cursor()
-        c.execute(
+        return self._reader().execute(
             """SELECT nm.id,
                       nm.node_id,
                       nm.world_item_id,
@@ -1127,9 +1449,9 @@ class Database:
                WHERE nm.node_id=?
                ORDER BY nm.position, wi.title""",
             (node_id,),
-        )
-        return c.fetchall()
+        ).fetchall()
 
+    @_writes
     def note_member_add(
         self,
         node_id: int,
@@ -1179,11 +1501,10 @@ class Database:
             ).fetchone()
             position = int(row[0] if row and row[0] is not None else 0)
 
-        c.execute(
+        nm_id = self._insert(c,
             "INSERT INTO note_members(node_id, world_item_id, position) VALUES (?,?,?)",
             (node_id, world_item_id, position),
         )
-        nm_id = int(c.lastrowid)
 
         # Apply implied tag if present
         tag_id = node["implied_tag_id"]
@@ -1191,9 +1512,10 @@ class Database:
             # This will no-op if the tag is already attached
             self.world_item_tag_add(world_item_id, tag_id, source=f"notes-node:{node_id}")
 
-        self.conn.commit()
+        self._commit()
         return nm_id
 
+    @_writes
     def note_member_remove(self, node_id: int, world_item_id: int) -> None:
         """
         Remove a world item from a membership node.
@@ -1230,7 +1552,7 @@ class Database:
                 # we can refine this to only remove tags with source='notes-node:*'.
                 self.world_item_tag_remove(world_item_id, implied_tag_id)
 
-        self.conn.commit()
+        self._commit()
 
     # ---- World items ----
 
@@ -1239,7 +1561,7 @@ class Database:
         Return world items of a given type for a project (ignores deleted).
         If item_type is falsy, returns all types.
         """
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         if item_type:
             c.execute(
                 """SELECT id, title, COALESCE(type,'') AS kind
@@ -1259,12 +1581,19 @@ class Database:
         return c.fetchall()
 
     def world_items_by_category(self, project_id: int, category_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, title
+        return self._reader().execute("""SELECT id, title
                      FROM world_items
                      WHERE project_id=? AND category_id=? AND COALESCE(deleted,0)=0
-                     ORDER BY position, id""", (project_id, category_id))
-        return c.fetchall()
+                     ORDER BY position, id""", (project_id, category_id)).fetchall()
+
+    def world_items_all(self, project_id: int) -> list[sqlite3.Row]:
+        """
+        Return every live world item of a project in sibling order. You can group/filter in Python.
+        """
+        return self._reader().execute("""SELECT id, category_id, title
+                     FROM world_items
+                     WHERE project_id=? AND COALESCE(deleted,0)=0
+                     ORDER BY position, id""", (project_id,)).fetchall()
 
     def world_items_grouped(self):
         q = """
@@ -1273,59 +1602,58 @@ class Database:
         WHERE COALESCE(deleted,0)=0
         ORDER BY LOWER(title)
         """
-        return self.conn.execute(q).fetchall()
+        return self._reader().execute(q).fetchall()
 
     def world_item_is_character(self, world_item_id: int) -> bool:
-        c = self.conn.cursor()
-        c.execute("SELECT type FROM world_items WHERE id=?", (world_item_id,))
-        r = c.fetchone()
-        return r["type"] == "character"
+        return self.world_item_type(world_item_id) == "character"
 
     def world_item(self, world_item_id: int) -> Optional[str]:
-        c = self.conn.cursor()
-        c.execute("SELECT title FROM world_items WHERE id=?", (world_item_id,))
-        r = c.fetchone()
-        return r["title"] if r else None
+        title = self._world_title_cache.get(world_item_id)
+        if title is None:
+            r = self._reader().execute("SELECT title FROM world_items WHERE id=?", (world_item_id,)).fetchone()
+            if not r:
+                return None
+            title = self._world_title_cache[world_item_id] = r["title"]
+        return title
 
     def world_item_meta(self, world_item_id: int) -> Optional[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("SELECT id, category_id, title, type, content_md, content_render FROM world_items WHERE id=?", (world_item_id,))
-        return c.fetchone()
+        return self._reader().execute("SELECT id, category_id, title, type, content_md, content_render FROM world_items WHERE id=?", (world_item_id,)).fetchone()
+
+    def world_item_title_and_type(self, world_item_id: int) -> Optional[sqlite3.Row]:
+        """id/title/type only -- for callers that don't need the markdown or rendered HTML."""
+        return self._reader().execute("SELECT id, title, type FROM world_items WHERE id=?", (world_item_id,)).fetchone()
 
     def world_item_type(self, world_item_id: int) -> Optional[str]:
-        c = self.conn.cursor()
-        c.execute("SELECT type FROM world_items WHERE id=?", (world_item_id,))
-        r = c.fetchone()
-        return r["type"] if r else None
+        try:
+            return self._world_type_cache[world_item_id]
+        except KeyError:
+            pass
+        r = self._reader().execute("SELECT type FROM world_items WHERE id=?", (world_item_id,)).fetchone()
+        if not r:
+            return None  # not cached: the id may be created later
+        self._world_type_cache[world_item_id] = r["type"]
+        return r["type"]
 
     def world_items_list_for_kind(self, project_id: int, kind: str) -> list[int]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id, title FROM world_items
+        return self._reader().execute("""SELECT id, title FROM world_items
                     WHERE project_id=? AND type=? AND COALESCE(deleted,0)=0
-                    ORDER BY position, id""", (project_id, kind))
-        return c.fetchall()
+                    ORDER BY position, id""", (project_id, kind)).fetchall()
     
     def world_item_list_ids(self, project_id: int, category_id: int) -> list[int]:
-        c = self.conn.cursor()
-        c.execute("""SELECT id FROM world_items
+        rows = self._reader().execute("""SELECT id FROM world_items
                     WHERE project_id=? AND category_id=? AND COALESCE(deleted,0)=0
-                    ORDER BY position, id""", (project_id, category_id))
-        return [int(r[0]) for r in c.fetchall()]
+                    ORDER BY position, id""", (project_id, category_id)).fetchall()
+        return [int(r[0]) for r in rows]
 
+    @_writes
     def world_item_insert_at_index(self, project_id: int, category_id: int,
                                 title: str, insert_index: int, item_type: str) -> int:
-        ids = self.world_item_list_ids(project_id, category_id)
-        insert_index = max(0, min(insert_index, len(ids)))
-        # temp append; we’ll rewrite positions anyway
-        c = self.conn.cursor()
-        c.execute("""INSERT INTO world_items(project_id, category_id, title, content_md, content_render, position, type)
-                    VALUES (?,?,?,?,?,?,?)""", (project_id, category_id, title.strip(), "", "", 0, item_type))
-        new_id = int(c.lastrowid)
-
-        ids.insert(insert_index, new_id)
-        for pos, wid in enumerate(ids):
-            c.execute("UPDATE world_items SET position=?, updated_at=CURRENT_TIMESTAMP WHERE id=?", (pos, wid))
-        self.conn.commit()
+        new_id = self._insert_positioned(
+            "world_items", "project_id=? AND category_id=? AND COALESCE(deleted,0)=0",
+            (project_id, category_id), insert_index,
+            ("project_id", "category_id", "title", "content_md", "content_render", "type"),
+            (project_id, category_id, title.strip(), "", "", item_type))
+        self._commit()
         return new_id
 
     # TODO: figure out what to do with category_id when none is given
@@ -1337,12 +1665,14 @@ class Database:
         item_type: str = "",
         content_md: str = "",
         aliases: dict[str, str] | None = None,
+        content_render: str | None = None,
     ) -> int:
         """
         Create a new world item.
 
         - category_id can be None (no world_category row required).
         - Sorting / grouping can be done by item_type instead of category.
+        - content_render: pre-rendered HTML for content_md; rendered here if None.
         - Returns the new world_item id.
         """
         if aliases is None:
@@ -1353,39 +1683,55 @@ class Database:
             raise ValueError("world_item_insert: title cannot be empty")
 
         content_md = content_md or ""
-        html = md_to_html(content_md, css=None, include_scaffold=False)
+        if content_render is not None:
+            html = content_render
+        elif content_md.strip():
+            html = md_to_html(content_md, css=None, include_scaffold=False)
+        else:
+            html = ""  # nothing to render; most new items start empty
 
-        c = self.conn.cursor()
-        c.execute(
-            """
-            INSERT INTO world_items
-                (project_id, category_id, title, type, content_md, content_render)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (project_id, category_id, title, item_type.strip(), content_md.strip(), html),
-        )
-        wid = int(c.lastrowid)
-        self.conn.commit()
+        with self.transaction():
+            c = self.conn.cursor()
+            wid = self._insert(c,
+                """
+                INSERT INTO world_items
+                    (project_id, category_id, title, type, content_md, content_render)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (project_id, category_id, title, item_type.strip(), content_md.strip(), html),
+            )
 
-        # add aliases
-        if title not in aliases:
-            aliases[title] = "alias"
-        self.alias_add_multiple(wid, aliases)
-        self.alias_set_primary(wid, alias_title=title)
+            # add aliases; the item is new, so there is nothing to dedupe against
+            # and the title's alias can be written as primary directly
+            if title not in aliases:
+                aliases[title] = "alias"
+            primary = _normalize_alias(title)
+            new: dict[str, tuple[str, str]] = {}
+            for alias, alias_type in aliases.items():
+                alias = (alias or "").strip()
+                if alias:
+                    new.setdefault(_normalize_alias(alias), (alias, alias_type))
+            self.conn.execute("""INSERT INTO world_aliases (world_item_id, alias, alias_type, alias_norm, is_primary)
+                        SELECT ?, json_extract(value, '$[0]'), json_extract(value, '$[1]'), json_extract(value, '$[2]'),
+                               json_extract(value, '$[2]') = ?
+                        FROM json_each(?)""",
+                (wid, primary, json.dumps([[alias, alias_type, norm] for norm, (alias, alias_type) in new.items()])))
 
         return wid
 
+    @_writes
     def world_item_update_content(self, world_item_id: int, md: str) -> None:
         self.conn.execute("""UPDATE world_items
                              SET content_md=?, updated_at=CURRENT_TIMESTAMP
                              WHERE id=?""", (md, world_item_id))
-        self.conn.commit()
+        self._commit()
     
+    @_writes
     def world_item_render_update(self, world_item_id, html_content):
-        cur = self.conn.cursor()
-        cur.execute("UPDATE world_items SET content_render=? WHERE id=?", (html_content, world_item_id))
-        self.conn.commit()
+        self.conn.execute("UPDATE world_items SET content_render=? WHERE id=?", (html_content, world_item_id))
+        self._commit()
 
+    @_writes
     def world_item_update_text_and_render(
         self,
         world_item_id: int,
@@ -1393,8 +1739,7 @@ class Database:
         content_render: str,
     ) -> None:
         """Update both the markdown and HTML snapshot for a world item."""
-        c = self.conn.cursor()
-        c.execute(
+        self.conn.execute(
             """
             UPDATE world_items
                SET content_md    = ?,
@@ -1404,23 +1749,29 @@ class Database:
             """,
             (content_md, content_render, world_item_id),
         )
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def world_item_update(self, world_item_id: int, title: Optional[str]=None, position: Optional[int]=None, content_md: Optional[str]=None) -> None:
         self.conn.execute("""UPDATE world_items
                              SET title=COALESCE(?, title), position=COALESCE(?, position), content_md=COALESCE(?, content_md), updated_at=CURRENT_TIMESTAMP
                              WHERE id=?""", (title, position, content_md, world_item_id))
-        self.conn.commit()
+        if title is not None:
+            self._world_title_cache.pop(world_item_id, None)
+        self._commit()
 
+    @_writes
     def world_item_rename(self, world_item_id: int, new_title: str) -> None:
         self.conn.execute("UPDATE world_items SET title=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                           (new_title, world_item_id))
-        self.conn.commit()
+        self._world_title_cache.pop(world_item_id, None)
+        self._commit()
 
+    @_writes
     def world_item_soft_delete(self, world_item_id: int) -> None:
         self.conn.execute("UPDATE world_items SET deleted=1, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                           (world_item_id,))
-        self.conn.commit()
+        self._commit()
 
     def world_index_for_project(self, project_id: int) -> list[dict]:
         """
@@ -1448,8 +1799,7 @@ class Database:
                 ...
             ]
         """
-        c = self.conn.cursor()
-        c.execute(
+        rows = self._reader().execute(
             """
             SELECT
                 wi.id          AS world_item_id,
@@ -1470,8 +1820,7 @@ class Database:
             ORDER BY LOWER(wi.title), wi.id, wa.is_primary DESC, wa.alias
             """,
             (project_id,),
-        )
-        rows = c.fetchall()
+        ).fetchall()
 
         index_by_item: dict[int, dict] = {}
 
@@ -1509,12 +1858,13 @@ class Database:
     def world_phrases_for_project_detailed(self, project_id: int, ids: list[int] | None = None):
         """
         Return [(phrase_norm, world_item_id, alias_id)] for ACTIVE aliases in this project.
+        phrase_norm is the stored alias_norm (see _normalize_alias), so no per-row
+        normalization happens here.
         If ids is provided, limit to those world_item ids.
         If ids is an empty list, returns no results.
         """
-        c = self.conn.cursor()
         sql = """
-            SELECT LOWER(TRIM(REPLACE(wa.alias, '  ', ' '))) AS phrase_norm,
+            SELECT COALESCE(wa.alias_norm, LOWER(TRIM(wa.alias))) AS phrase_norm,
                 wa.world_item_id AS world_item_id,
                 wa.id AS alias_id
             FROM world_aliases wa
@@ -1527,23 +1877,20 @@ class Database:
         if ids is not None:
             if ids == []:
                 return []
-            placeholders = ",".join("?" for _ in ids)
-            sql += f" AND wa.world_item_id IN ({placeholders})"
-            params.extend(int(x) for x in ids)
+            # a JSON array keeps the statement text fixed, so it stays in the statement cache
+            sql += " AND wa.world_item_id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps([int(x) for x in ids]))
         sql += " ORDER BY LENGTH(wa.alias) DESC, wa.world_item_id"
-        c.execute(sql, params)
-        return [(r["phrase_norm"], int(r["world_item_id"]), int(r["alias_id"])) for r in c.fetchall()]
+        rows = self._reader().execute(sql, params).fetchall()
+        return [(r["phrase_norm"], int(r["world_item_id"]), int(r["alias_id"])) for r in rows]
 
+    @_writes
     def set_chapter_world_refs(self, chapter_id: int, world_ids: Sequence[int]) -> None:
         """
         Replaces all refs for `chapter_id` with the provided `world_ids` (deduped).
         """
-        c = self.conn.cursor()
-        c.execute("DELETE FROM chapter_world_refs WHERE chapter_id=?", (chapter_id,))
-        uniq = sorted(set(int(w) for w in world_ids))
-        c.executemany("""INSERT OR IGNORE INTO chapter_world_refs(chapter_id, world_item_id)
-                        VALUES (?,?)""", [(chapter_id, wid) for wid in uniq])
-        self.conn.commit()
+        self._set_world_refs("chapter_world_refs", "chapter_id", chapter_id, world_ids)
+        self._commit()
 
 
     # --- Ingest candidates (basic helpers)
@@ -1558,11 +1905,11 @@ class Database:
         project_id = self.chapter_project_id(chapter_id)
         candidates = self.candidates_for_scope(project_id=project_id, scope_type="chapter", scope_id=chapter_id,
                                         version_id=version_id, statuses=statuses, columns="*")
-        print(f"ingest_candidates_by_chapter: found {len(candidates)} candidates for chapter_id={chapter_id}, version_id={version_id}")
-        # print db's candidates
-        print([f'id={r["id"]} cand="{r["candidate"]}"' for r in candidates])
+        log.debug("ingest_candidates_by_chapter: %d candidates for chapter_id=%s version_id=%s",
+                  len(candidates), chapter_id, version_id)
         return candidates
 
+    @_writes
     def ingest_candidate_upsert(self, *, project_id: int, scope_type: str, scope_id: int,
                                 version_id: int | None, candidate: str,
                                 kind_guess: str | None = None, source: str | None = None,
@@ -1602,13 +1949,13 @@ class Database:
                     updated_at=CURRENT_TIMESTAMP
                 WHERE id=?
             """, (kind_guess, source, confidence, status, start_off, end_off, context, cid))
-            self.conn.commit()
-            print(f"[ingest_candidate_upsert] UPDATE cid={cid} candidate='{cand}' "
-                f"scope=({scope_type},{scope_id},{version_id}) src={source} conf={confidence} status={status}")
+            self._commit()
+            log.debug("ingest_candidate_upsert UPDATE cid=%s candidate=%r scope=(%s,%s,%s) src=%s conf=%s status=%s",
+                      cid, cand, scope_type, scope_id, version_id, source, confidence, status)
             return cid
 
         # 3) INSERT new
-        c.execute("""
+        cid = self._insert(c, """
             INSERT INTO ingest_candidates
                 (project_id, scope_type, scope_id, version_id,
                 candidate, kind_guess, source, confidence, status,
@@ -1618,48 +1965,47 @@ class Database:
         """, (project_id, scope_type, scope_id, version_id,
             cand, kind_guess, source, confidence, status,
             start_off, end_off, context))
-        cid = int(c.lastrowid)
-        self.conn.commit()
-        print(f"[ingest_candidate_upsert] INSERT cid={cid} candidate='{cand}' "
-            f"scope=({scope_type},{scope_id},{version_id}) src={source} conf={confidence} status={status} start_off={start_off} end_off={end_off} context={context}")
+        self._commit()
+        log.debug("ingest_candidate_upsert INSERT cid=%s candidate=%r scope=(%s,%s,%s) src=%s conf=%s status=%s "
+                  "start_off=%s end_off=%s", cid, cand, scope_type, scope_id, version_id, source, confidence,
+                  status, start_off, end_off)
         return cid
 
+    @_writes
     def ingest_candidate_mark_resolved(self, cand_id: int, *, target_world_item_id: int, status: str) -> None:
-        cur = self.conn.cursor()
-        cur.execute("""
+        self.conn.execute("""
             UPDATE ingest_candidates
             SET target_world_item_id=?, status=?
             WHERE id=?""", (target_world_item_id, status, cand_id))
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def ingest_candidate_mark_dismissed(self, cand_id: int) -> None:
-        c = self.conn.cursor()
-        c.execute("""
+        self.conn.execute("""
             UPDATE ingest_candidates
             SET status='dismissed', target_world_item_id=NULL, updated_at=CURRENT_TIMESTAMP
             WHERE id=?
         """, (cand_id,))
-        self.conn.commit()
+        self._commit()
 
+    @_writes
     def ingest_candidate_link_world(self, candidate_id: int, world_item_id: int):
         self.conn.execute("UPDATE ingest_candidates SET link_world_id=? WHERE id=?",
                 (world_item_id, candidate_id))
-        self.conn.commit()
+        self._commit()
 
     # --- Linker support ----------------------------------------------------
     def known_world_phrases(self, project_id):
         """
         Return [(wid, alias_id_or_None, phrase_lower)] for titles + ACTIVE aliases.
         """
-        cur = self.conn.cursor()
-        out = []
-        # Titles
-        cur.execute("SELECT id, title FROM world_items WHERE project_id=? AND COALESCE(deleted,0)=0", (project_id,))
-        for wid, title in cur.fetchall():
-            if title:
-                out.append((int(wid), None, title.strip().lower()))
-        # Active aliases
-        cur.execute("""
+        # titles and active aliases in one statement; lower() stays in Python because
+        # SQLite's LOWER() only folds ASCII
+        rows = self._reader().execute("""
+            SELECT id, NULL, title
+            FROM world_items
+            WHERE project_id=? AND COALESCE(deleted,0)=0 AND title IS NOT NULL AND title!=''
+            UNION ALL
             SELECT wa.world_item_id, wa.id, wa.alias
             FROM world_aliases wa
             JOIN world_items wi ON wi.id=wa.world_item_id
@@ -1667,10 +2013,9 @@ class Database:
             AND COALESCE(wa.deleted,0)=0
             AND COALESCE(wa.status,'active')='active'
             AND wa.alias IS NOT NULL AND TRIM(wa.alias)!=''
-        """, (project_id,))
-        for wid, alias_id, alias in cur.fetchall():
-            out.append((int(wid), int(alias_id), alias.strip().lower()))
-        return out
+        """, (project_id, project_id)).fetchall()
+        return [(int(wid), None if alias_id is None else int(alias_id), phrase.strip().lower())
+                for wid, alias_id, phrase in rows]
 
     def candidates_for_scope(self, *, project_id: int,
                             scope_type: str, scope_id: int,
@@ -1683,49 +2028,47 @@ class Database:
         # allow string
         if isinstance(statuses, str):
             statuses = (statuses,)
-        c = self.conn.cursor()
-        ph = ",".join("?" * len(statuses))
+        # statuses travel as one JSON array, so the SQL text depends only on `columns`
+        # and whether a version is given, and stays in the statement cache
+        statuses_json = json.dumps(list(statuses))
         if version_id is None:
             sql = f"""
                 SELECT {columns}
                 FROM ingest_candidates
                 WHERE project_id=? AND scope_type=? AND scope_id=?
-                AND COALESCE(status,'pending') IN ({ph})
+                AND COALESCE(status,'pending') IN (SELECT value FROM json_each(?))
             """
-            params = (project_id, scope_type, scope_id, *statuses)
+            params = (project_id, scope_type, scope_id, statuses_json)
         else:
             sql = f"""
                 SELECT {columns}
                 FROM ingest_candidates
                 WHERE project_id=? AND scope_type=? AND scope_id=? AND version_id=?
-                AND COALESCE(status,'pending') IN ({ph})
+                AND COALESCE(status,'pending') IN (SELECT value FROM json_each(?))
             """
-            params = (project_id, scope_type, scope_id, version_id, *statuses)
-        print(f"[candidates_for_scope] {sql.strip()}  params={params}")
-        rows = c.execute(sql, params).fetchall()
-        print(f"[candidates_for_scope] returned {len(rows)} rows")
+            params = (project_id, scope_type, scope_id, version_id, statuses_json)
+        rows = self._reader().execute(sql, params).fetchall()
+        log.debug("candidates_for_scope %s params=%s -> %d rows", sql, params, len(rows))
         return rows
 
     def chapter_candidates_basic(self, scope_id, statuses=("pending","linked")):
         """
         Return [(id, label, source)] for chapter-scoped ingest candidates in the given statuses.
         """
-        cur = self.conn.cursor()
-        placeholders = ",".join("?" for _ in statuses)
-        cur.execute(f"""
+        rows = self._reader().execute("""
             SELECT id, label, source
             FROM ingest_candidates
-            WHERE scope_type='chapter' AND scope_id=? AND COALESCE(status,'pending') IN ({placeholders})
-        """, (scope_id, *statuses))
-        return [(int(cid), (label or "").strip(), (source or "").lower()) for cid, label, source in cur.fetchall()]
+            WHERE scope_type='chapter' AND scope_id=?
+            AND COALESCE(status,'pending') IN (SELECT value FROM json_each(?))
+        """, (scope_id, json.dumps(list(statuses)))).fetchall()
+        return [(int(cid), (label or "").strip(), (source or "").lower()) for cid, label, source in rows]
 
     def ingest_candidate_row(self, cand_id):
         """
         Return a tuple with (project_id, scope_type, scope_id, version_id, candidate,
                 kind_guess, COALESCE(source,''), confidence, status, target_world_item_id).
         """
-        cur = self.conn.cursor()
-        row = cur.execute("""
+        row = self._reader().execute("""
             SELECT project_id, scope_type, scope_id, version_id, candidate,
                 kind_guess, COALESCE(source,''), confidence, status, target_world_item_id
             FROM ingest_candidates
@@ -1733,13 +2076,11 @@ class Database:
         return row  # tuple
 
     def alias_note(self, alias_id):
-        cur = self.conn.cursor()
-        row = cur.execute("SELECT note FROM world_aliases WHERE id=?", (alias_id,)).fetchone()
+        row = self._reader().execute("SELECT note FROM world_aliases WHERE id=?", (alias_id,)).fetchone()
         return row[0] if row else None
 
     def world_item_md(self, world_item_id):
-        cur = self.conn.cursor()
-        row = cur.execute("SELECT content_md FROM world_items WHERE id=?", (world_item_id,)).fetchone()
+        row = self._reader().execute("SELECT content_md FROM world_items WHERE id=?", (world_item_id,)).fetchone()
         return row[0] if row else ""
 
     def fetch_text_for_doc(self, *, doc_type, doc_id, version_id=None):
@@ -1753,6 +2094,7 @@ class Database:
         # TODO: implement when notes/outlines have tables
         return ""
 
+    @_writes
     def set_world_item_refs(self, world_item_id: int, world_ids: list[int]):
         """
         Cache 'which world items are referenced by this world_item's text' (ID list).
@@ -1771,189 +2113,182 @@ class Database:
             VALUES(?, ?)
             ON CONFLICT(world_item_id) DO UPDATE SET ids_csv=excluded.ids_csv
         """, (world_item_id, csv))
-        self.conn.commit()
+        self._commit()
 
     def set_doc_refs(self, *, doc_type, doc_id, version_id=None, world_ids: list[int]):
         if doc_type == "chapter":
             # assumes you already have these methods
-            self.set_chapter_version_world_refs(version_id, sorted(set(world_ids or [])))
-            av = self.get_active_version_id(doc_id)
-            if av and int(av) == int(version_id):
-                self.set_chapter_world_refs(doc_id, sorted(set(world_ids or [])))
+            with self.transaction():
+                self.set_chapter_version_world_refs(version_id, sorted(set(world_ids or [])))
+                av = self.get_active_version_id(doc_id)
+                if av and int(av) == int(version_id):
+                    self.set_chapter_world_refs(doc_id, sorted(set(world_ids or [])))
         elif doc_type == "world_item":
             self.set_world_item_refs(doc_id, world_ids or [])
         else:
             # TODO: extend when notes/outlines have a cache table
             pass
 
+    @_writes
     def chapter_version_render_update(self, version_id, html_content):
-        cur = self.conn.cursor()
-        cur.execute("""
+        self.conn.execute("""
             UPDATE chapter_versions
             SET content_render=?, format_updated_at=CURRENT_TIMESTAMP
             WHERE id=?
         """, (html_content, version_id))
-        self.conn.commit()
+        self._commit()
 
     # --- Metrics cache ----------------------------------------------------------
 
     def metrics_get(self, chapter_id: int, chapter_version_id: int, source_hash: str):
-        c = self.conn.cursor()
-        c.execute("""SELECT * FROM chapter_metrics
+        return self._reader().execute("""SELECT * FROM chapter_metrics
                     WHERE chapter_id=? AND chapter_version_id=? AND source_hash=? LIMIT 1""",
-                (chapter_id, chapter_version_id, source_hash))
-        return c.fetchone()
+                (chapter_id, chapter_version_id, source_hash)).fetchone()
 
+    @_writes
     def metrics_upsert(self, chapter_id: int, chapter_version_id: int, source_hash: str, m: dict):
-        c = self.conn.cursor()
-        # try update
-        c.execute("""UPDATE chapter_metrics
-                    SET word_count=?, char_count=?, paragraph_count=?, sentence_count=?,
-                        avg_sentence_len=?, type_token_ratio=?, dialogue_words=?, dialogue_ratio=?,
-                        reading_secs=?, est_pages=?, updated_at=CURRENT_TIMESTAMP
-                    WHERE chapter_id=? AND chapter_version_id=? AND source_hash=?""",
-                (m["word_count"], m["char_count"], m["paragraph_count"], m["sentence_count"],
-                m["avg_sentence_len"], m["type_token_ratio"], m["dialogue_words"], m["dialogue_ratio"],
-                m["reading_secs"], m["est_pages"], chapter_id, chapter_version_id, source_hash))
-        if c.rowcount == 0:
-            c.execute("""INSERT INTO chapter_metrics
-                        (chapter_id, chapter_version_id, source_hash, word_count, char_count,
-                        paragraph_count, sentence_count, avg_sentence_len, type_token_ratio,
-                        dialogue_words, dialogue_ratio, reading_secs, est_pages)
-                        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                    (chapter_id, chapter_version_id, source_hash, m["word_count"], m["char_count"],
-                    m["paragraph_count"], m["sentence_count"], m["avg_sentence_len"],
-                    m["type_token_ratio"], m["dialogue_words"], m["dialogue_ratio"],
-                    m["reading_secs"], m["est_pages"]))
-        self.conn.commit()
+        # one statement against uq_metrics_source: insert, or refresh the existing row
+        self.conn.execute("""INSERT INTO chapter_metrics
+                    (chapter_id, chapter_version_id, source_hash, word_count, char_count,
+                    paragraph_count, sentence_count, avg_sentence_len, type_token_ratio,
+                    dialogue_words, dialogue_ratio, reading_secs, est_pages)
+                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+                    ON CONFLICT(chapter_id, chapter_version_id, source_hash) DO UPDATE SET
+                        word_count=excluded.word_count, char_count=excluded.char_count,
+                        paragraph_count=excluded.paragraph_count, sentence_count=excluded.sentence_count,
+                        avg_sentence_len=excluded.avg_sentence_len, type_token_ratio=excluded.type_token_ratio,
+                        dialogue_words=excluded.dialogue_words, dialogue_ratio=excluded.dialogue_ratio,
+                        reading_secs=excluded.reading_secs, est_pages=excluded.est_pages,
+                        updated_at=CURRENT_TIMESTAMP""",
+                (chapter_id, chapter_version_id, source_hash, m["word_count"], m["char_count"],
+                m["paragraph_count"], m["sentence_count"], m["avg_sentence_len"],
+                m["type_token_ratio"], m["dialogue_words"], m["dialogue_ratio"],
+                m["reading_secs"], m["est_pages"]))
+        self._commit()
 
     # --- Characters ---
     def character_facets(self, character_id: int) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT * FROM character_facets
-                    WHERE character_id=? ORDER BY position, id""", (character_id,))
-        return c.fetchall()
+        return self._reader().execute(f"""SELECT {_FACET_SELECT} FROM character_facets
+                    WHERE character_id=? ORDER BY position, id""", (character_id,)).fetchall()
     
     def character_facet_exists(self, character_id: int, facet_type: str, label: str) -> bool:
-        c = self.conn.cursor()
-        c.execute("""
+        row = self._reader().execute("""
             SELECT 1 FROM character_facets
             WHERE character_id=? AND facet_type=? AND lower(trim(label))=lower(trim(?))
             AND COALESCE(deleted,0)=0
             LIMIT 1
-        """, (character_id, facet_type, label))
-        return c.fetchone() is not None
+        """, (character_id, facet_type, label)).fetchone()
+        return row is not None
+
+    def character_facets_grouped(self, character_id: int) -> dict[str, list[sqlite3.Row]]:
+        """All of a character's facets in one query, bucketed by facet_type (each in position order)."""
+        grouped: dict[str, list[sqlite3.Row]] = defaultdict(list)
+        for r in self.character_facets(character_id):
+            grouped[r["facet_type"]].append(r)
+        return grouped
 
     def character_facets_by_type(self, character_id: int, facet_type: str) -> list[sqlite3.Row]:
-        c = self.conn.cursor()
-        c.execute("""SELECT * FROM character_facets
+        return self._reader().execute(f"""SELECT {_FACET_SELECT} FROM character_facets
                     WHERE character_id=? AND facet_type=?
-                    ORDER BY position, id""", (character_id, facet_type))
-        return c.fetchall()
+                    ORDER BY position, id""", (character_id, facet_type)).fetchall()
 
+    @_writes
     def character_facet_insert(self, character_id: int, facet_type: str,
                             label: str = "", value: str = "", note: str = "",
                             link_world_id: int | None = None,
                             status: str | None = None, priority: int | None = None,
                             due_chapter_id: int | None = None, insert_index: int | None = None) -> int:
-        # compute position
-        c = self.conn.cursor()
-        c.execute("""SELECT id FROM character_facets WHERE character_id=? ORDER BY position, id""",
-                (character_id,))
-        ids = [r[0] for r in c.fetchall()]
-        if insert_index is None:
-            insert_index = len(ids)
-        insert_index = max(0, min(insert_index, len(ids)))
-
-        # temp insert; rewrite positions
-        c.execute("""INSERT INTO character_facets
-                    (character_id, facet_type, label, value, note, link_world_id, status, priority, due_chapter_id, position)
-                    VALUES (?,?,?,?,?,?,?,?,?,0)""",
-                (character_id, facet_type, label.strip(), value.strip(), note.strip() if note else "",
-                link_world_id, status, priority, due_chapter_id))
-        new_id = int(c.lastrowid)
-        ids.insert(insert_index, new_id)
-
-        for pos, fid in enumerate(ids):
-            c.execute("""UPDATE character_facets SET position=?, updated_at=CURRENT_TIMESTAMP WHERE id=?""",
-                    (pos, fid))
-        self.conn.commit()
+        new_id = self._insert_positioned(
+            "character_facets", "character_id=?", (character_id,), insert_index,
+            ("character_id", "facet_type", "label", "value", "note", "link_world_id",
+             "status", "priority", "due_chapter_id"),
+            (character_id, facet_type, label.strip(), value.strip(), note.strip() if note else "",
+             link_world_id, status, priority, due_chapter_id))
+        self._commit()
         return new_id
 
+    @_writes
     def character_facet_update(self, facet_id: int, **fields) -> None:
         if not fields:
             return
-        cols = []
+        unknown = set(fields) - set(_FACET_COLS)
+        if unknown:
+            raise ValueError(f"character_facet_update: unknown column(s) {sorted(unknown)}")
+        # one fixed statement for every key combination: (supplied?, value) per column,
+        # so an explicit None still clears the column
         vals = []
-        for k,v in fields.items():
-            cols.append(f"{k}=?")
-            vals.append(v)
-        cols.append("updated_at=CURRENT_TIMESTAMP")
-        sql = f"UPDATE character_facets SET {', '.join(cols)} WHERE id=?"
+        for col in _FACET_COLS:
+            vals += (col in fields, fields.get(col))
         vals.append(facet_id)
-        self.conn.execute(sql, tuple(vals))
-        self.conn.commit()
+        self.conn.execute(_FACET_UPDATE_SQL, vals)
+        self._commit()
 
     def character_facet_delete(self, facet_id: int) -> None:
-        # remove and compact positions
-        c = self.conn.cursor()
-        c.execute("SELECT character_id FROM character_facets WHERE id=?", (facet_id,))
-        row = c.fetchone()
-        if not row:
-            return
-        char_id = int(row[0])
-        c.execute("DELETE FROM character_facets WHERE id=?", (facet_id,))
-        c.execute("""SELECT id FROM character_facets
-                    WHERE character_id=? ORDER BY position, id""", (char_id,))
-        ids = [r[0] for r in c.fetchall()]
-        for pos, fid in enumerate(ids):
-            c.execute("UPDATE character_facets SET position=? WHERE id=?", (pos, fid))
-        self.conn.commit()
-
+        # close the gap in the same transaction, so the next insert stays on the
+        # dense (single shift UPDATE) path of character_facet_insert
+        with self.transaction():
+            row = self.conn.execute("SELECT character_id FROM character_facets WHERE id=?",
+                                    (facet_id,)).fetchone()
+            if not row:
+                return
+            self.conn.execute("DELETE FROM character_facets WHERE id=?", (facet_id,))
+            self.character_facets_compact(row[0])
+
+    @_writes
+    def character_facets_compact(self, character_id: int) -> None:
+        """Renumber a character's facet positions to 0..N-1 in one statement."""
+        self.conn.execute("""
+            UPDATE character_facets SET position = s.rn - 1
+            FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) AS rn
+                  FROM character_facets WHERE character_id=?) AS s
+            WHERE character_facets.id = s.id AND character_facets.position IS NOT s.rn - 1
+        """, (character_id,))
+        self._commit()
+
+    @_writes
     def character_facets_reorder(self, character_id: int, new_order_ids: list[int]) -> None:
-        c = self.conn.cursor()
-        # ensure all belong to character_id
-        q = ",".join("?" for _ in new_order_ids)
-        c.execute(f"SELECT id FROM character_facets WHERE character_id=? AND id IN ({q})",
-                (character_id, *new_order_ids))
-        got = {int(r[0]) for r in c.fetchall()}
-        if got != set(new_order_ids):
-            # ignore or raise; here we ignore to be resilient
-            pass
-        for pos, fid in enumerate(new_order_ids):
-            c.execute("UPDATE character_facets SET position=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-                    (pos, fid))
-        self.conn.commit()
+        # one statement: json_each yields (key=index, value=id); ids belonging to
+        # another character are ignored rather than raising, to stay resilient
+        self.conn.execute("""
+            UPDATE character_facets SET position = j.key, updated_at=CURRENT_TIMESTAMP
+            FROM json_each(?) AS j
+            WHERE character_facets.id = j.value AND character_facets.character_id = ?
+              AND character_facets.position IS NOT j.key
+        """, (json.dumps([int(fid) for fid in new_order_ids]), character_id))
+        self._commit()
 
     def facet_template_labels(self, project_id:int, kind:str) -> list[str]:
-        cur = self.conn.cursor()
-        cur.execute("""SELECT label FROM facet_templates
-                    WHERE project_id=? AND kind=? ORDER BY position, id""", (project_id, kind))
-        return [r[0] for r in cur.fetchall()]
+        labels = self._facet_labels_cache.get((project_id, kind))
+        if labels is None:
+            rows = self._reader().execute("""SELECT label FROM facet_templates
+                        WHERE project_id=? AND kind=? ORDER BY position, id""", (project_id, kind)).fetchall()
+            labels = self._facet_labels_cache[(project_id, kind)] = [r[0] for r in rows]
+        return list(labels)
 
     # ---- UI Preferences (per-project key-value store)
     def ui_pref_get(self, project_id: int, key: str) -> str | None:
-        cur = self.conn.cursor()
-        cur.execute("SELECT value FROM ui_prefs WHERE project_id=? AND key=?", (project_id, key))
-        row = cur.fetchone()
+        row = self._reader().execute("SELECT value FROM ui_prefs WHERE project_id=? AND key=?", (project_id, key)).fetchone()
         return (row["value"] if hasattr(row, "keys") and "value" in row.keys() else row[0]) if row else None
 
+    @_writes
     def ui_pref_set(self, project_id: int, key: str, value: str) -> None:
         self.conn.execute(
             "INSERT INTO ui_prefs(project_id, key, value) VALUES(?,?,?) "
             "ON CONFLICT(project_id, key) DO UPDATE SET value=excluded.value",
             (project_id, key, value),
         )
-        self.conn.commit()
+        self._commit()
 
     # ---- FTS (chapter & world)
+    @_writes
     def fts_rebuild(self) -> None:
         """Rebuild FTS tables if they exist."""
         if self._has_table("fts_chapters"):
             self.conn.execute("INSERT INTO chapters_fts(chapters_fts) VALUES('rebuild')")
             self.conn.execute("INSERT INTO world_items_fts(world_items_fts) VALUES('rebuild')")
-            self.conn.commit()
+            self._commit()
 
+    @_writes
     def chapters_fts_upsert(self, chapter_id: int, title: str, text: str) -> None:
         """Refresh FTS row for a chapter. No-op if FTS table doesn't exist."""
         if not self._has_table("chapters_fts"):
@@ -1967,15 +2302,156 @@ class Database:
 
     # ---- Helpers
     def _has_table(self, name: str) -> bool:
-        c = self.conn.cursor()
-        c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,))
-        return c.fetchone() is not None
-        self.conn.commit()
+        found = self._table_cache.get(name)
+        if found is None:
+            row = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone()
+            found = self._table_cache[name] = row is not None
+        return found
 
     # ---- Transactions (optional helpers)
     def begin(self): self.conn.execute("BEGIN")
     def commit(self): self.conn.commit()
     def rollback(self): self.conn.rollback()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group several mutators into a single commit:
+
+            with db.transaction():
+                db.world_item_rename(...)
+                db.alias_add(...)
+
+        Mutators called inside the block skip their own commit; the outermost
+        block commits on exit, or rolls back if an exception escapes. Blocks nest.
+        """
+        # the writer connection is shared; a block or mutator on another thread
+        # waits here instead of interleaving its statements into this transaction
+        with self._writing():
+            outer = self._tx_depth == 0
+            if outer and not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if outer:
+                    self.conn.rollback()
+                    # rows cached inside the block may no longer exist
+                    self._clear_caches()
+                raise
+            self._tx_depth -= 1
+            if outer:
+                self.conn.commit()
+
+    @contextmanager
+    def _writing(self):
+        """Hold the writer lock, recording this thread as the one writing to `self.conn`."""
+        with self._write_lock:
+            prev, self._writer = self._writer, threading.get_ident()
+            try:
+                yield
+            finally:
+                self._writer = prev
+
+    def _clear_caches(self) -> None:
+        self._world_type_cache.clear()
+        self._world_title_cache.clear()
+        self._project_cache.clear()
+        self._category_name_cache.clear()
+        self._ver_text_cache.clear()
+        self._active_ver_cache.clear()
+        self._facet_labels_cache.clear()
+
+    def _insert(self, c: sqlite3.Cursor | sqlite3.Connection, sql: str, params: Sequence = ()) -> int:
+        """Run a plain INSERT on cursor (or connection) `c` and return the new row id."""
+        # fetchall() steps the statement to completion before any commit
+        return int(c.execute(sql + " RETURNING id", params).fetchall()[0][0])
+
+    def _insert_positioned(self, table: str, scope: str, scope_args: tuple,
+                           insert_index: Optional[int], cols: Sequence[str], values: Sequence) -> int:
+        """
+        Insert (`cols`, `values`) into `table` at `insert_index` (None: at the end) among
+        the siblings matching the WHERE fragment `scope`, keeping their positions
+        0..N-1. Returns the new id; callers commit.
+        """
+        c = self.conn.cursor()
+        c.execute(f"""SELECT COUNT(*), COUNT(DISTINCT position), MIN(position), MAX(position)
+                    FROM {table} WHERE {scope}""", scope_args)
+        n, dense = _dense_positions(c.fetchone())
+        if insert_index is None:
+            insert_index = n
+        insert_index = max(0, min(insert_index, n))
+
+        if dense:
+            # positions are already 0..N-1: open a gap with one UPDATE
+            c.execute(f"UPDATE {table} SET position = position + 1 WHERE {scope} AND position >= ?",
+                      (*scope_args, insert_index))
+        else:
+            # gaps or ties: renumber the siblings to 0..N-1 around the new slot in one
+            # statement, updating only rows that move
+            c.execute(f"""
+                UPDATE {table} SET position = s.rn + (s.rn >= ?)
+                FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) - 1 AS rn
+                      FROM {table} WHERE {scope}) AS s
+                WHERE {table}.id = s.id AND {table}.position IS NOT s.rn + (s.rn >= ?)
+            """, (insert_index, *scope_args, insert_index))
+        return self._insert(c, f"""INSERT INTO {table} ({", ".join(cols)}, position)
+                    VALUES ({", ".join("?" * (len(cols) + 1))})""", (*values, insert_index))
+
+    def _set_world_refs(self, table: str, owner_col: str, owner_id: int, world_ids: Iterable[int]) -> None:
+        """
+        Make `owner_id`'s world_item_id rows in `table` exactly `world_ids`. Diffed in
+        SQL: unchanged refs are neither deleted nor re-inserted. Callers commit.
+        """
+        ids_json = json.dumps(sorted(set(int(w) for w in world_ids)))
+        self.conn.execute(f"""DELETE FROM {table}
+                    WHERE {owner_col}=? AND world_item_id NOT IN (SELECT value FROM json_each(?))""",
+                  (owner_id, ids_json))
+        self.conn.execute(f"""INSERT OR IGNORE INTO {table}({owner_col}, world_item_id)
+                    SELECT ?, value FROM json_each(?)""", (owner_id, ids_json))
+
+    def _commit(self) -> None:
+        """Commit now unless this thread has a `transaction()` block open."""
+        # under the lock, an open block can only belong to the calling thread
+        with self._writing():
+            if not self._tx_depth:
+                self.conn.commit()
+
+    def save_snapshot(self, path: str | None = None) -> None:
+        """Copy the whole database into `path` (default: the snapshot it was opened with)."""
+        path = path or self.snapshot
+        if not path:
+            return
+        dst = sqlite3.connect(path)
+        try:
+            self.conn.backup(dst)
+        finally:
+            dst.close()
+
     # ---- Close
-    def close(self): self.conn.close()
+    def close(self):
+        """Close all connections, folding the WAL back into the main file first. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._backup_thread is not None:
+            self._backup_thread.join()
+        with self._reader_lock:
+            for rc in self._reader_conns:
+                rc.close()
+            self._reader_conns.clear()
+        self._readers = threading.local()
+        try:
+            if not self.in_memory:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        finally:
+            self.conn.close()
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
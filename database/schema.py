@@ -397,6 +397,21 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
         ON ingest_candidates(project_id, scope_type, scope_id, candidate);
     """)
 
+    # --- Ordering indexes: (filter columns, position); id rides along as the rowid ---
+    cur.executescript("""
+    CREATE INDEX IF NOT EXISTS idx_books_proj_pos ON books(project_id, position);
+    CREATE INDEX IF NOT EXISTS idx_chver_chapter_vn ON chapter_versions(chapter_id, version_number);
+    CREATE INDEX IF NOT EXISTS idx_world_categories_proj_pos
+        ON world_categories(project_id, position) WHERE COALESCE(deleted,0)=0;
+    CREATE INDEX IF NOT EXISTS idx_world_items_proj_cat_pos
+        ON world_items(project_id, category_id, position) WHERE COALESCE(deleted,0)=0;
+    CREATE INDEX IF NOT EXISTS idx_world_items_proj_pos
+        ON world_items(project_id, position) WHERE COALESCE(deleted,0)=0;
+    CREATE INDEX IF NOT EXISTS idx_facet_templates_proj_kind_pos
+        ON facet_templates(project_id, kind, position);
+    CREATE INDEX IF NOT EXISTS idx_notes_docs_node_pos ON notes_docs(node_id, position);
+    """)
+
     # # --- FTS5 (search) ---
     # try:
     #     cur.executescript("""
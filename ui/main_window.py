@@ -61,7 +61,8 @@ class StoryArkivist(QMainWindow):
         self._tracer = _Tracer()
         app.installEventFilter(self._tracer)
 
-    def __init__(self, dev_mode: bool = False, db_path: str = "db.sqlite3"):
+    def __init__(self, dev_mode: bool = False, db_path: str = "db.sqlite3", db_uri: bool = False,
+                 db_snapshot: str | None = None):
         super().__init__()
         
         # self._install_key_tracer()
@@ -70,7 +71,7 @@ class StoryArkivist(QMainWindow):
         self.resize(1200, 700)
         self._squelch_anchor_until_ms = 0
 
-        self.db = Database(db_path)
+        self.db = Database(db_path, uri=db_uri, snapshot=db_snapshot)
         self.charactersPage = CharactersPage(self, self.db)
         self.outlineWorkspace = OutlineWorkspace()
         print("APP sees controller", id(self.outlineWorkspace.page.undoController))
@@ -97,8 +98,8 @@ class StoryArkivist(QMainWindow):
         self._chapter_dirty = False
 
         # load some data (dev mode)
-        if self.dev_mode:
-            # populate some demo data for dev mode
+        if self.dev_mode and not self.db.restored_from_snapshot:
+            # populate some demo data for dev mode (a restored snapshot already has it)
             self.populate_demo_data()
             self._emit_chapter_order()
 
@@ -117,8 +118,7 @@ class StoryArkivist(QMainWindow):
         settings = QSettings("Arkivist", "StoryArkivist")
         mru = settings.value("mru_project_id", type=int)
 
-        count = self.db.project_quantity()
-        if count == 0:
+        if not self.db.project_any():
             # First-ever run: create a project immediately so UI can render
             self._current_project_id = self.db.project_create("Untitled Project")
             settings.setValue("mru_project_id", int(self._current_project_id))
@@ -388,8 +388,8 @@ class StoryArkivist(QMainWindow):
                 chap_id = None
         else:
             # fallback to first chapter in this book
-            rows = self.db.chapter_list(pid, bid)  # ordered
-            chap_id = rows[0]["id"] if rows else None
+            first = self.db.chapter_list_first(pid, bid)
+            chap_id = first["id"] if first else None
 
         if chap_id:
             self.focus_chapter_in_tree(chap_id)  # your existing helper
@@ -424,7 +424,7 @@ class StoryArkivist(QMainWindow):
 
     def _ensure_project_exists_or_prompt(self):
         """On first launch (or if all projects are deleted), create 'Untitled Project' and open the manager focused on rename."""
-        if self.db.project_quantity() > 0:
+        if self.db.project_any():
             # ensure we have a current project id
             # just pick the first active project (#TODO: remember last used?)
             self._current_project_id = self.db.project_first_active()
@@ -977,8 +977,7 @@ class StoryArkivist(QMainWindow):
         wid = row["target_world_item_id"] or self.ensure_world_item_from_candidate(row)
         if wid:
             # Optional: seed starter MD if brand-new and none exists
-            meta = self.db.world_item_meta(wid)
-            md   = (meta["content_md"] or "").strip()
+            md   = (self.db.world_item_md(wid) or "").strip()
             if not md:
                 scaffold = f"# {surf}\n\n"
                 self.db.world_item_update_content(wid, scaffold)
@@ -996,20 +995,17 @@ class StoryArkivist(QMainWindow):
         return None, None
 
     def resolve_candidate_to_existing(self, cand_id: int, wid: int, also_alias: bool):
-        cur = self.db.conn.cursor()
-        # 1) mark candidate as linked
-        cur.execute("UPDATE ingest_candidates SET status='linked', target_world_item_id=? WHERE id=?",
-                    (wid, cand_id))
-        # 2) optional alias
-        if also_alias:
-            # Pull candidate
-            row = cur.execute("SELECT label FROM ingest_candidates WHERE id=?", (cand_id,)).fetchone()
-            if row and row[0]:
-                alias = row[0].strip()
-                if alias:
-                    cur.execute("INSERT INTO world_aliases(world_item_id, alias, status, deleted) VALUES(?, ?, 'active', 0)",
-                                (wid, alias))
-        self.db.conn.commit()
+        with self.db.transaction():
+            # 1) mark candidate as linked
+            self.db.ingest_candidate_mark_resolved(cand_id, target_world_item_id=wid, status="linked")
+            # 2) optional alias
+            if also_alias:
+                # Pull candidate
+                row = self.db.conn.execute("SELECT label FROM ingest_candidates WHERE id=?", (cand_id,)).fetchone()
+                if row and row[0]:
+                    alias = row[0].strip()
+                    if alias:
+                        self.db.alias_add(wid, alias, "alias")
         # 3) refresh
         # self.recompute_chapter_references(self._current_chapter_id)
         chap_id, ver_id = self.resolve_candidate_chapter_and_version(cand_id)
@@ -1069,12 +1065,7 @@ class StoryArkivist(QMainWindow):
                 self._render_center_preview(ver_id)
 
     def link_candidate_to_existing(self, cand_id: int, wid: int):
-        cur = self.db.conn.cursor()
-        cur.execute("""
-            UPDATE ingest_candidates
-            SET status='linked', target_world_item_id=?
-            WHERE id=?""", (wid, cand_id))
-        self.db.conn.commit()
+        self.db.ingest_candidate_mark_resolved(cand_id, target_world_item_id=wid, status="linked")
         self._render_center_preview()  # relink now that a known item exists
 
     def reject_candidate(self, cand_id: int, rerender: bool = True) -> None:
@@ -1180,7 +1171,7 @@ class StoryArkivist(QMainWindow):
         pid = self._current_project_id
         if not pid:
             return
-        has_roots = self.db.world_categories_count(pid) > 0
+        has_roots = self.db.world_categories_any(pid)
         if has_roots:
             return
         # Seed a few roots (#TODO: set default roots based on project type)
@@ -1236,7 +1227,6 @@ class StoryArkivist(QMainWindow):
         base_name = choice["name"]  # may be None if multiple files
         wtype = self.infer_world_type_from_category(parent_cid)
 
-        cur = self.db.conn.cursor()
         last_world_id = None
 
         for p in paths:
@@ -1255,8 +1245,7 @@ class StoryArkivist(QMainWindow):
                 continue
 
             # insert world item with chosen category and inferred type
-            self.db.world_item_insert(self._current_project_id, parent_cid, name, wtype, md)
-            wid = cur.lastrowid
+            wid = self.db.world_item_insert(self._current_project_id, parent_cid, name, wtype, md)
             last_world_id = wid
 
             self.rebuild_world_item_render(wid)
@@ -1390,17 +1379,16 @@ class StoryArkivist(QMainWindow):
             # Placement logic
             if len(paths) == 1:
                 # simple: append to end
-                cur.execute("SELECT COALESCE(MAX(position), -1) FROM chapters WHERE project_id=? AND book_id=?", (pid, bid))
-                max_position = cur.fetchone()[0]
-                insert_at = (max_position) + 1
                 p = paths[0]
                 order_hint, clean = parse_chapter_filename(Path(p).name, split_mode=None)
                 md = read_file_as_markdown(p)
-                new_id = self.db.chapter_insert(pid, bid, insert_at, clean, md)
-                ver_id = self.db.get_active_version_id(new_id)
-                if ver_id:
-                    self.db.chapter_version_render_update(ver_id, md_to_html(md))
-                self.db.conn.commit()
+                with self.db.transaction():
+                    cur.execute("SELECT COALESCE(MAX(position), -1) FROM chapters WHERE project_id=? AND book_id=?", (pid, bid))
+                    insert_at = cur.fetchone()[0] + 1
+                    new_id = self.db.chapter_insert(pid, bid, insert_at, clean, md)
+                    ver_id = self.db.get_active_version_id(new_id)
+                    if ver_id:
+                        self.db.chapter_version_render_update(ver_id, md_to_html(md))
                 self.recompute_chapter_references(new_id, md)
                 self.populate_chapters_tree()
                 self.outlineWorkspace.load_from_db(self.db, self._current_project_id, self._current_book_id)
@@ -1449,28 +1437,29 @@ class StoryArkivist(QMainWindow):
 
             N = len(parsed)
 
-            # === open a gap for bulk insert (critical to avoid interleaving) ===
-            cur.execute("""
-                UPDATE chapters
-                SET position = position + ?
-                WHERE project_id=? AND book_id=? AND position >= ?
-            """, (N, pid, bid, base_index))
-
-            # === insert contiguously into the gap ===
-            new_ids = []
-            for i, (_, _, title, p) in enumerate(parsed):
-                md = read_file_as_markdown(p)
-                new_id = self.db.chapter_insert(pid, bid, base_index + i, title, md)
-                ver_id = self.db.get_active_version_id(new_id)
-                if ver_id:
-                    self.db.chapter_version_render_update(ver_id, md_to_html(md))
-                new_ids.append(new_id)
-                self.recompute_chapter_references(new_id, md)
+            # single commit for the whole import
+            with self.db.transaction():
+                # === open a gap for bulk insert (critical to avoid interleaving) ===
+                cur.execute("""
+                    UPDATE chapters
+                    SET position = position + ?
+                    WHERE project_id=? AND book_id=? AND position >= ?
+                """, (N, pid, bid, base_index))
+
+                # === insert contiguously into the gap ===
+                new_ids = []
+                for i, (_, _, title, p) in enumerate(parsed):
+                    md = read_file_as_markdown(p)
+                    new_id = self.db.chapter_insert(pid, bid, base_index + i, title, md)
+                    ver_id = self.db.get_active_version_id(new_id)
+                    if ver_id:
+                        self.db.chapter_version_render_update(ver_id, md_to_html(md))
+                    new_ids.append(new_id)
+                    self.recompute_chapter_references(new_id, md)
+
+                # === normalize positions to 0..M-1 (optional but nice) ===
+                self.db.chapter_compact_positions(pid, bid)
 
-            # === normalize positions to 0..M-1 (optional but nice) ===
-            self.db.chapter_compact_positions(pid, bid)
-
-            self.db.conn.commit()
             self.populate_chapters_tree()
             self.outlineWorkspace.load_from_db(self.db, self._current_project_id, self._current_book_id)
             if new_ids:
@@ -1767,9 +1756,9 @@ class StoryArkivist(QMainWindow):
 
     def _on_outline_insert_requested(self, book_id: int, insert_at: int, title: str):
         pid = self._current_project_id
-        new_cid = self.db.chapter_insert(pid, book_id, insert_at, title, content_md="")
-        self.db.chapter_compact_positions(pid, book_id)
-        self.db.conn.commit()
+        with self.db.transaction():
+            new_cid = self.db.chapter_insert(pid, book_id, insert_at, title, content_md="")
+            self.db.chapter_compact_positions(pid, book_id)
         self._refresh_outline_and_tree(book_id, focus_cid=new_cid)
 
     def _on_outline_rename_requested(self, chap_id: int, new_title: str):
@@ -1779,19 +1768,18 @@ class StoryArkivist(QMainWindow):
             self.centerTabs.update_doc_title("chapter", chap_id, new_title)
 
         meta = self.db.chapter_meta(chap_id)
-        self.db.conn.commit()
         self._refresh_outline_and_tree(meta["book_id"], focus_cid=chap_id)
 
     def _on_outline_move_requested(self, chap_id: int, to_book_id: int, to_index: int):
         meta = self.db.chapter_meta(chap_id)
         pid, from_book = meta["project_id"], meta["book_id"]
-        # Move to target index (your API):
-        self.db.chapter_move_to_index(pid, to_book_id, chap_id, to_index)
-        # Compact both books (source & dest) in case of inter-book move
-        self.db.chapter_compact_positions(pid, from_book)
-        if to_book_id != from_book:
-            self.db.chapter_compact_positions(pid, to_book_id)
-        self.db.conn.commit()
+        with self.db.transaction():
+            # Move to target index (your API):
+            self.db.chapter_move_to_index(pid, to_book_id, chap_id, to_index)
+            # Compact both books (source & dest) in case of inter-book move
+            self.db.chapter_compact_positions(pid, from_book)
+            if to_book_id != from_book:
+                self.db.chapter_compact_positions(pid, to_book_id)
         self._refresh_outline_and_tree(to_book_id, focus_cid=chap_id)
 
     def _on_outline_delete_requested(self, chap_id: int):
@@ -2517,8 +2505,6 @@ class StoryArkivist(QMainWindow):
         insert_pos = last_pos_idx + 1
         new_id = self.db.chapter_insert(self._current_project_id, self._current_book_id, insert_pos, "New Chapter", "")
 
-        self.db.conn.commit()
-
         self.populate_chapters_tree()
         self.outlineWorkspace.load_from_db(self.db, self._current_project_id, self._current_book_id)
         if hasattr(self, "focus_chapter_in_tree"):
@@ -2619,19 +2605,20 @@ class StoryArkivist(QMainWindow):
             #     SET position = position + ?
             #     WHERE project_id=? AND book_id=? AND position >= ? AND COALESCE(deleted,0)=0
             # """, (N, pid, bid, base_index))
-            self.db.chapter_position_gap(N, pid, bid, base_index)
+            with self.db.transaction():
+                self.db.chapter_position_gap(N, pid, bid, base_index)
 
-            # === Insert files into the gap ===
-            new_ids = []
-            for i, (_, _, title, p) in enumerate(parsed):
-                md = read_file_as_markdown(p)
-                new_id = self.db.chapter_insert(pid, bid, base_index + i, title, md)
-                new_ids.append(new_id)
-                # detect refs per chapter
-                self.recompute_chapter_references(new_id, md)
+                # === Insert files into the gap ===
+                new_ids = []
+                for i, (_, _, title, p) in enumerate(parsed):
+                    md = read_file_as_markdown(p)
+                    new_id = self.db.chapter_insert(pid, bid, base_index + i, title, md)
+                    new_ids.append(new_id)
+                    # detect refs per chapter
+                    self.recompute_chapter_references(new_id, md)
 
-            # === Normalize 0..M-1 positions (deleted rows ignored) ===
-            self.db.chapter_compact_positions(pid, bid)
+                # === Normalize 0..M-1 positions (deleted rows ignored) ===
+                self.db.chapter_compact_positions(pid, bid)
 
             self.populate_chapters_tree()
             self.outlineWorkspace.load_from_db(self.db, self._current_project_id, self._current_book_id)
@@ -2733,8 +2720,7 @@ class StoryArkivist(QMainWindow):
             self.focus_chapter_in_tree(int(cur_chap_id))
 
     def _emit_chapter_order(self):
-        rows = self.db.chapter_list(self._current_project_id, self._current_book_id)
-        ordered_ids = [r["id"] for r in rows]
+        ordered_ids = self.db.chapter_ids(self._current_project_id, self._current_book_id)
         self.chaptersOrderChanged.emit(self._current_project_id, self._current_book_id, ordered_ids)
 
     def populate_world_tree(self):
@@ -2757,19 +2743,29 @@ class StoryArkivist(QMainWindow):
             parent.addChild(node)
             return node
 
+        # one read for all categories and one for all items, then bucket by parent
+        cats_by_parent: dict[int | None, list] = {}
+        for r in self.db.world_categories_all(pid):
+            cats_by_parent.setdefault(r["parent_id"], []).append(r)
+        items_by_cat: dict[int | None, list] = {}
+        for r in self.db.world_items_all(pid):
+            items_by_cat.setdefault(r["category_id"], []).append(r)
+
         def recurse(cat_node, cat_id):
-            for scid, scname in self.db.world_categories_children(cat_id, pid):
-                scnode = add_cat_node(scid, scname, cat_node)
+            for sc in cats_by_parent.get(cat_id, []):
+                scid = sc["id"]
+                scnode = add_cat_node(scid, sc["name"], cat_node)
                 # items under this
-                for iid, ititle in self.db.world_items_by_category(project_id=pid, category_id=scid):
-                    add_item_node(iid, ititle, scnode)
+                for it in items_by_cat.get(scid, []):
+                    add_item_node(it["id"], it["title"], scnode)
                 recurse(scnode, scid)
 
         # top-level categories
-        for cid, cname in self.db.world_categories_top_level(pid):
-            cnode = add_cat_node(cid, cname, None)
-            for iid, ititle in self.db.world_items_by_category(project_id=pid, category_id=cid):
-                add_item_node(iid, ititle, cnode)
+        for c in cats_by_parent.get(None, []):
+            cid = c["id"]
+            cnode = add_cat_node(cid, c["name"], None)
+            for it in items_by_cat.get(cid, []):
+                add_item_node(it["id"], it["title"], cnode)
             recurse(cnode, cid)
 
         self.worldTree.expandAll()
@@ -2903,19 +2899,21 @@ class StoryArkivist(QMainWindow):
 
         touched = [x for x in {src_book_item, dest_book_item} if x]
 
-        for book_item in touched:
-            bdata = book_item.data(0, Qt.UserRole)
-            if not (bdata and bdata[0] == "book"):
-                continue
-            bid = int(bdata[1])
+        # one transaction for the whole drop: a single commit instead of one per chapter
+        with self.db.transaction():
+            for book_item in touched:
+                bdata = book_item.data(0, Qt.UserRole)
+                if not (bdata and bdata[0] == "book"):
+                    continue
+                bid = int(bdata[1])
 
-            ids = ordered_chapter_ids(book_item)
-            # persist the visual order via db helpers
-            for pos, cid in enumerate(ids):
-                self.db.chapter_move_to_index(pid, bid, cid, pos)
+                ids = ordered_chapter_ids(book_item)
+                # persist the visual order via db helpers
+                for pos, cid in enumerate(ids):
+                    self.db.chapter_move_to_index(pid, bid, cid, pos)
 
-            # normalize positions to 0..N-1, skipping deleted
-            self.db.chapter_compact_positions(pid, bid)
+                # normalize positions to 0..N-1, skipping deleted
+                self.db.chapter_compact_positions(pid, bid)
 
         # refresh both UIs
         self.populate_chapters_tree()
@@ -3057,7 +3055,7 @@ class StoryArkivist(QMainWindow):
     def _load_title_and_text(self, chap_id: int, version_id: int | None):
         # Title from chapter meta
         meta = self.db.chapter_meta(chap_id)
-        title = meta.get("title") if isinstance(meta, dict) else meta["title"]
+        title = meta["title"] if meta else None
         # Text for active or a specific version
         md = self.db.chapter_content(chap_id, version_id=version_id) or ""
         return title or "", md
@@ -3189,10 +3187,7 @@ class StoryArkivist(QMainWindow):
         if self._current_chapter_id is None: return
         old_title = self.db.chapter(self._current_chapter_id)
         title = self.titleEdit.text().strip()
-        cur = self.db.conn.cursor()
-        cur.execute("UPDATE chapters SET title=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-                    (title, self._current_chapter_id))
-        self.db.conn.commit()
+        self.db.set_chapter_title(self._current_chapter_id, title)
         # update FTS row via trigger; refresh tree label
         if not old_title == title:
             if hasattr(self, "centerTabs") and self.centerTabs is not None:
@@ -3413,14 +3408,15 @@ class StoryArkivist(QMainWindow):
         # Extract suggestions (spaCy + optional heuristics)
         suggestions = self.quick_parse_text(md, doc_type=doc_type, doc_id=doc_id, version_id=ver_id)
 
-        # Upsert candidates *with the same resolved scope+version*
-        for s in suggestions:
-            self.db.ingest_candidate_upsert(
-                project_id=pid, scope_type=doc_type, scope_id=doc_id, version_id=ver_id,
-                candidate=s["surface"], kind_guess=s.get("kind_guess"), source="quick",
-                confidence=s.get("confidence"), status="pending",
-                start_off=s.get("start_off"), end_off=s.get("end_off"), context=s.get("context")
-            )
+        # Upsert candidates *with the same resolved scope+version*, committed once
+        with self.db.transaction():
+            for s in suggestions:
+                self.db.ingest_candidate_upsert(
+                    project_id=pid, scope_type=doc_type, scope_id=doc_id, version_id=ver_id,
+                    candidate=s["surface"], kind_guess=s.get("kind_guess"), source="quick",
+                    confidence=s.get("confidence"), status="pending",
+                    start_off=s.get("start_off"), end_off=s.get("end_off"), context=s.get("context")
+                )
         # Refresh the viewer that shows links for this scope
         if doc_type == "chapter":
             # Recompute refs using the *same* md we just parsed
@@ -3534,11 +3530,9 @@ class StoryArkivist(QMainWindow):
         if r:
             return int(r["id"])
         # create minimal
-        c.execute("""INSERT INTO world_items (project_id, type, title)
-                    VALUES (?,?,?)""", (pid, kind, t))
-        wid = int(c.lastrowid)
-        self.db.conn.commit()
-        return wid
+        if not t:
+            return None
+        return self.db.world_item_insert(pid, title=t, item_type=kind)
 
     def ensure_world_item_from_candidate(self, cand_row) -> int | None:
         title = (cand_row["candidate"] or "").strip()
@@ -3577,28 +3571,26 @@ class StoryArkivist(QMainWindow):
 
     # ---------- DnD persistence ----------
     def sync_chapters_order_from_tree(self):
-        cur = self.db.conn.cursor()
-        for i in range(self.chaptersTree.topLevelItemCount()):
-            bnode = self.chaptersTree.topLevelItem(i)
-            bdata = bnode.data(0, Qt.UserRole)
-            if not bdata or bdata[0] != "book": 
-                continue
-            book_id = bdata[1]
-            ordered_ids = []
-            for j in range(bnode.childCount()):
-                cnode = bnode.child(j)
-                cdata = cnode.data(0, Qt.UserRole)
-                if cdata and cdata[0] == "chapter":
-                    ordered_ids.append(int(cdata[1]))
-            for pos, cid in enumerate(ordered_ids):
-                cur.execute("UPDATE chapters SET book_id=?, position=? WHERE id=?", (book_id, pos, cid))
-        self.db.conn.commit()
+        with self.db.transaction():
+            for i in range(self.chaptersTree.topLevelItemCount()):
+                bnode = self.chaptersTree.topLevelItem(i)
+                bdata = bnode.data(0, Qt.UserRole)
+                if not bdata or bdata[0] != "book": 
+                    continue
+                book_id = bdata[1]
+                ordered_ids = []
+                for j in range(bnode.childCount()):
+                    cnode = bnode.child(j)
+                    cdata = cnode.data(0, Qt.UserRole)
+                    if cdata and cdata[0] == "chapter":
+                        ordered_ids.append(int(cdata[1]))
+                self.db.chapter_set_order(book_id, ordered_ids)
         # repaint on next tick to avoid flicker or half-state
         QTimer.singleShot(0, self.populate_chapters_tree)
 
     def sync_world_order_from_tree(self):
-        cur = self.db.conn.cursor()
         # Persist categories positions/parents and items' category
+        cats, items = [], []
         def recurse(parent_node, parent_cat_id):
             # first pass: categories positions
             cpos = 0
@@ -3606,15 +3598,14 @@ class StoryArkivist(QMainWindow):
                 ch = parent_node.child(i)
                 d = ch.data(0, Qt.UserRole)
                 if d and d[0] == "world_cat":
-                    cur.execute("UPDATE world_categories SET parent_id=?, position=? WHERE id=?",
-                                (parent_cat_id, cpos, d[1]))
+                    cats.append((parent_cat_id, cpos, d[1]))
                     cpos += 1
             # second pass: items (keep alphabetical; no explicit position needed)
             for i in range(parent_node.childCount()):
                 ch = parent_node.child(i)
                 d = ch.data(0, Qt.UserRole)
                 if d and d[0] == "world_item":
-                    cur.execute("UPDATE world_items SET category_id=? WHERE id=?", (parent_cat_id, d[1]))
+                    items.append((parent_cat_id, d[1]))
                 elif d and d[0] == "world_cat":
                     recurse(ch, d[1])
 
@@ -3623,9 +3614,9 @@ class StoryArkivist(QMainWindow):
             node = self.worldTree.topLevelItem(i)
             d = node.data(0, Qt.UserRole)
             if d and d[0] == "world_cat":
-                cur.execute("UPDATE world_categories SET parent_id=NULL, position=? WHERE id=?", (i, d[1]))
+                cats.append((None, i, d[1]))
                 recurse(node, d[1])
-        self.db.conn.commit()
+        self.db.world_tree_set_order(cats, items)
         self.populate_world_tree()
         self.populate_notes_tree()
 
@@ -3966,75 +3957,75 @@ class StoryArkivist(QMainWindow):
 
 
     def duplicate_project(self, src_project_id: int, new_name: str):
-        cur = self.db.conn.cursor()
-        # create new project
-        cur.execute("INSERT INTO projects(name) VALUES (?)", (new_name,))
-        new_pid = cur.lastrowid
-
-        # duplicate books
-        id_map_book = {}
-        cur.execute("SELECT id, name, position FROM books WHERE project_id=?", (src_project_id,))
-        for bid, name, pos in cur.fetchall():
-            cur.execute("INSERT INTO books(project_id, name, position) VALUES (?,?,?)", (new_pid, name, pos))
-            id_map_book[bid] = cur.lastrowid
-
-        # duplicate chapters
-        id_map_ch = {}
-        cur.execute("SELECT id, book_id, title, content, position FROM chapters WHERE project_id=? AND COALESCE(deleted,0)=0",
-                    (src_project_id,))
-        for cid, bid, title, content, pos in cur.fetchall():
-            nbid = id_map_book.get(bid)
-            cur.execute("""INSERT INTO chapters(project_id, book_id, title, content, position)
-                        VALUES (?,?,?,?,?)""", (new_pid, nbid, title, content, pos))
-            id_map_ch[cid] = cur.lastrowid
-
-        # duplicate world categories
-        id_map_wc = {}
-        cur.execute("""SELECT id, parent_id, name, position FROM world_categories 
-                    WHERE project_id=? AND COALESCE(deleted,0)=0""", (src_project_id,))
-        rows = cur.fetchall()
-        # two-pass to preserve parent mapping
-        for _ in range(2):
-            for cid, parent_id, name, pos in rows:
-                if cid in id_map_wc: continue
-                npid = id_map_wc.get(parent_id) if parent_id else None
-                if parent_id and npid is None: 
-                    continue
-                cur.execute("""INSERT INTO world_categories(project_id, parent_id, name, position)
-                            VALUES (?,?,?,?)""", (new_pid, npid, name, pos))
-                id_map_wc[cid] = cur.lastrowid
-
-        # duplicate world items
-        id_map_wi = {}
-        cur.execute("""SELECT id, category_id, title, content_md, content_render 
-                    FROM world_items WHERE project_id=? AND COALESCE(deleted,0)=0""", (src_project_id,))
-        for wid, cat_id, title, md, html_content in cur.fetchall():
-            ncat = id_map_wc.get(cat_id)
-            cur.execute("""INSERT INTO world_items(project_id, category_id, title, content_md, content_render)
-                        VALUES (?,?,?,?,?)""", (new_pid, ncat, title, md, html_content))
-            id_map_wi[wid] = cur.lastrowid
-
-        # duplicate aliases
-        cur.execute("""SELECT world_item_id, alias FROM world_aliases 
-                    WHERE world_item_id IN ({})""".format(",".join("?"*len(id_map_wi))) if id_map_wi else "SELECT 0 WHERE 0",
-                    tuple(id_map_wi.keys()))
-        for wid, alias in cur.fetchall():
-            cur.execute("INSERT INTO world_aliases(world_item_id, alias) VALUES (?,?)",
-                        (id_map_wi[wid], alias))
-
-        # duplicate links
-        if id_map_wi:
-            cur.execute("""SELECT source_id, target_id, relationship FROM world_links
-                        WHERE source_id IN ({}) AND target_id IN ({})"""
-                        .format(",".join("?"*len(id_map_wi)), ",".join("?"*len(id_map_wi))),
-                        tuple(id_map_wi.keys()) + tuple(id_map_wi.keys()))
-            for s, t, rel in cur.fetchall():
-                ns, nt = id_map_wi.get(s), id_map_wi.get(t)
-                if ns and nt:
-                    cur.execute("INSERT INTO world_links(source_id, target_id, relationship) VALUES (?,?,?)",
-                                (ns, nt, rel))
-
-        self.db.conn.commit()
+        # one transaction: a failed copy leaves no half-duplicated project behind
+        with self.db.transaction():
+            cur = self.db.conn.cursor()
+            # create new project
+            cur.execute("INSERT INTO projects(name) VALUES (?)", (new_name,))
+            new_pid = cur.lastrowid
+
+            # duplicate books
+            id_map_book = {}
+            cur.execute("SELECT id, name, position FROM books WHERE project_id=?", (src_project_id,))
+            for bid, name, pos in cur.fetchall():
+                cur.execute("INSERT INTO books(project_id, name, position) VALUES (?,?,?)", (new_pid, name, pos))
+                id_map_book[bid] = cur.lastrowid
+
+            # duplicate chapters
+            id_map_ch = {}
+            cur.execute("SELECT id, book_id, title, content, position FROM chapters WHERE project_id=? AND COALESCE(deleted,0)=0",
+                        (src_project_id,))
+            for cid, bid, title, content, pos in cur.fetchall():
+                nbid = id_map_book.get(bid)
+                cur.execute("""INSERT INTO chapters(project_id, book_id, title, content, position)
+                            VALUES (?,?,?,?,?)""", (new_pid, nbid, title, content, pos))
+                id_map_ch[cid] = cur.lastrowid
+
+            # duplicate world categories
+            id_map_wc = {}
+            cur.execute("""SELECT id, parent_id, name, position FROM world_categories 
+                        WHERE project_id=? AND COALESCE(deleted,0)=0""", (src_project_id,))
+            rows = cur.fetchall()
+            # two-pass to preserve parent mapping
+            for _ in range(2):
+                for cid, parent_id, name, pos in rows:
+                    if cid in id_map_wc: continue
+                    npid = id_map_wc.get(parent_id) if parent_id else None
+                    if parent_id and npid is None: 
+                        continue
+                    cur.execute("""INSERT INTO world_categories(project_id, parent_id, name, position)
+                                VALUES (?,?,?,?)""", (new_pid, npid, name, pos))
+                    id_map_wc[cid] = cur.lastrowid
+
+            # duplicate world items
+            id_map_wi = {}
+            cur.execute("""SELECT id, category_id, title, content_md, content_render 
+                        FROM world_items WHERE project_id=? AND COALESCE(deleted,0)=0""", (src_project_id,))
+            for wid, cat_id, title, md, html_content in cur.fetchall():
+                ncat = id_map_wc.get(cat_id)
+                cur.execute("""INSERT INTO world_items(project_id, category_id, title, content_md, content_render)
+                            VALUES (?,?,?,?,?)""", (new_pid, ncat, title, md, html_content))
+                id_map_wi[wid] = cur.lastrowid
+
+            # duplicate aliases
+            cur.execute("""SELECT world_item_id, alias, alias_norm FROM world_aliases 
+                        WHERE world_item_id IN ({})""".format(",".join("?"*len(id_map_wi))) if id_map_wi else "SELECT 0, 0, 0 WHERE 0",
+                        tuple(id_map_wi.keys()))
+            for wid, alias, alias_norm in cur.fetchall():
+                cur.execute("INSERT INTO world_aliases(world_item_id, alias, alias_norm) VALUES (?,?,?)",
+                            (id_map_wi[wid], alias, alias_norm))
+
+            # duplicate links
+            if id_map_wi:
+                cur.execute("""SELECT source_id, target_id, relationship FROM world_links
+                            WHERE source_id IN ({}) AND target_id IN ({})"""
+                            .format(",".join("?"*len(id_map_wi)), ",".join("?"*len(id_map_wi))),
+                            tuple(id_map_wi.keys()) + tuple(id_map_wi.keys()))
+                for s, t, rel in cur.fetchall():
+                    ns, nt = id_map_wi.get(s), id_map_wi.get(t)
+                    if ns and nt:
+                        cur.execute("INSERT INTO world_links(source_id, target_id, relationship) VALUES (?,?,?)",
+                                    (ns, nt, rel))
 
     def switch_project(self, project_id: int):
         # save-all before switching
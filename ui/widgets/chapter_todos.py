@@ -102,10 +102,9 @@ class TodoTree(QTreeWidget):
         ordered.insert(insert_index, drag_id)
 
         # Persist to DB (0..N-1)
-        cur = self._app.conn.cursor()
-        for pos_i, nid in enumerate(ordered):
-            cur.execute("UPDATE chapter_notes SET position=? WHERE id=?", (pos_i, nid))
-        self._app.conn.commit()
+        with self._app.db.transaction() as db:
+            db.conn.executemany("UPDATE chapter_notes SET position=? WHERE id=?",
+                                [(pos_i, nid) for pos_i, nid in enumerate(ordered)])
 
         # Reload UI and focus the moved item
         self._owner.reload()
@@ -244,16 +243,16 @@ class ChapterTodosWidget(QWidget):
         If canceled or left blank, the placeholder is removed."""
         if not self._chapter_id:
             return
-        cur = self.app.db.conn.cursor()
-        # next position
-        cur.execute("""SELECT COALESCE(MAX(position), -1) FROM chapter_notes
-                    WHERE chapter_id=? AND kind='todo'""", (self._chapter_id,))
-        next_pos = (cur.fetchone()[0] or -1) + 1
-        # create empty placeholder
-        cur.execute("""INSERT INTO chapter_notes (chapter_id, kind, text, is_done, position)
-                    VALUES (?, 'todo', '', 0, ?)""", (self._chapter_id, next_pos))
-        self.app.db.conn.commit()
-        nid = cur.lastrowid
+        with self.app.db.transaction() as db:
+            cur = db.conn.cursor()
+            # next position
+            cur.execute("""SELECT COALESCE(MAX(position), -1) FROM chapter_notes
+                        WHERE chapter_id=? AND kind='todo'""", (self._chapter_id,))
+            next_pos = (cur.fetchone()[0] or -1) + 1
+            # create empty placeholder
+            cur.execute("""INSERT INTO chapter_notes (chapter_id, kind, text, is_done, position)
+                        VALUES (?, 'todo', '', 0, ?)""", (self._chapter_id, next_pos))
+            nid = cur.lastrowid
 
         # refresh UI, select new item
         self.reload()
@@ -276,9 +275,8 @@ class ChapterTodosWidget(QWidget):
         d = item.data(0, Qt.UserRole)
         if not d or d[0] != "todo": return
         _, nid, done = d
-        cur = self.app.db.conn.cursor()
-        cur.execute("UPDATE chapter_notes SET is_done=? WHERE id=?", (0 if done else 1, nid))
-        self.app.db.conn.commit()
+        with self.app.db.transaction() as db:
+            db.conn.execute("UPDATE chapter_notes SET is_done=? WHERE id=?", (0 if done else 1, nid))
         self.reload()
 
     def _todo_context_menu(self, pos):
@@ -303,17 +301,15 @@ class ChapterTodosWidget(QWidget):
             old_text = current_text_without_box()
             new_text, ok = QInputDialog.getText(self, "Edit To-Do", "To-Do text:", text=old_text)
             if ok and new_text.strip():
-                cur = self.app.db.conn.cursor()
-                cur.execute("UPDATE chapter_notes SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-                            (new_text.strip(), nid))
-                self.app.db.conn.commit()
+                with self.app.db.transaction() as db:
+                    db.conn.execute("UPDATE chapter_notes SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
+                                    (new_text.strip(), nid))
                 self.reload()
         elif a == actDel:
             nid = d[1]
-            cur = self.app.db.conn.cursor()
-            cur.execute("DELETE FROM chapter_notes WHERE id=?", (nid,))
-            self.app.db.conn.commit()
-            self._compact_todo_positions()
+            with self.app.db.transaction() as db:
+                db.conn.execute("DELETE FROM chapter_notes WHERE id=?", (nid,))
+                self._compact_todo_positions()
             self.reload()
 
     def _edit_selected_todo(self):
@@ -329,19 +325,18 @@ class ChapterTodosWidget(QWidget):
 
         new_text, ok = QInputDialog.getText(self, "Edit To-Do", "To-Do text:", text=old_text)
 
-        cur = self.app.db.conn.cursor()
         try:
             if ok and new_text.strip():
-                cur.execute("UPDATE chapter_notes SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-                            (new_text.strip(), nid))
-                self.app.db.conn.commit()
+                with self.app.db.transaction() as db:
+                    db.conn.execute("UPDATE chapter_notes SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
+                                    (new_text.strip(), nid))
             else:
                 # If this was a brand-new placeholder and user canceled/emptied, remove it
                 if self._pending_new_todo_id == nid:
-                    cur.execute("DELETE FROM chapter_notes WHERE id=?", (nid,))
-                    self.app.db.conn.commit()
+                    with self.app.db.transaction() as db:
+                        db.conn.execute("DELETE FROM chapter_notes WHERE id=?", (nid,))
+                        self._compact_todo_positions()
                     self._pending_new_todo_id = None
-                    self._compact_todo_positions()
         finally:
             self.reload()
             # clear pending marker if it wasn't already cleared
@@ -350,14 +345,14 @@ class ChapterTodosWidget(QWidget):
 
     def _compact_todo_positions(self):
         if not self._chapter_id: return
-        cur = self.app.db.conn.cursor()
-        cur.execute("""SELECT id FROM chapter_notes
-                       WHERE chapter_id=? AND kind='todo'
-                       ORDER BY position, id""", (self._chapter_id,))
-        ids = [r[0] for r in cur.fetchall()]
-        for pos, nid in enumerate(ids):
-            cur.execute("UPDATE chapter_notes SET position=? WHERE id=?", (pos, nid))
-        self.app.db.conn.commit()
+        with self.app.db.transaction() as db:
+            cur = db.conn.cursor()
+            cur.execute("""SELECT id FROM chapter_notes
+                           WHERE chapter_id=? AND kind='todo'
+                           ORDER BY position, id""", (self._chapter_id,))
+            ids = [r[0] for r in cur.fetchall()]
+            for pos, nid in enumerate(ids):
+                cur.execute("UPDATE chapter_notes SET position=? WHERE id=?", (pos, nid))
 
     def _todo_dropEvent(self, event):
         # Let Qt do the reorder (shows the drop line, may temporarily nest)
@@ -382,16 +377,15 @@ class ChapterTodosWidget(QWidget):
             pass
 
         # Persist order 0..N-1
-        cur = self.app.db.conn.cursor()
         ordered_ids = []
         for i in range(self.todoList.topLevelItemCount()):
             it = self.todoList.topLevelItem(i)
             d = it.data(0, Qt.UserRole)
             if d and d[0] == "todo":
                 ordered_ids.append(int(d[1]))
-        for pos, nid in enumerate(ordered_ids):
-            cur.execute("UPDATE chapter_notes SET position=? WHERE id=?", (pos, nid))
-        self.app.db.conn.commit()
+        with self.app.db.transaction() as db:
+            db.conn.executemany("UPDATE chapter_notes SET position=? WHERE id=?",
+                                list(enumerate(ordered_ids)))
 
         # (Optional) self.reload()
 
@@ -406,16 +400,16 @@ class ChapterTodosWidget(QWidget):
         if not self._notes_dirty:
             return
         txt = self.notesEdit.toPlainText().strip()
-        cur = self.app.db.conn.cursor()
-        if self._note_row_id is None:
-            if txt:
-                # create the single notes row
-                cur.execute("""INSERT INTO chapter_notes (chapter_id, kind, text, is_done, position)
-                               VALUES (?, 'note', ?, 0, 0)""", (chapter_id, txt))
-                self._note_row_id = cur.lastrowid
-        else:
-            cur.execute("UPDATE chapter_notes SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-                        (txt, self._note_row_id))
-        self.app.db.conn.commit()
+        with self.app.db.transaction() as db:
+            cur = db.conn.cursor()
+            if self._note_row_id is None:
+                if txt:
+                    # create the single notes row
+                    cur.execute("""INSERT INTO chapter_notes (chapter_id, kind, text, is_done, position)
+                                   VALUES (?, 'note', ?, 0, 0)""", (chapter_id, txt))
+                    self._note_row_id = cur.lastrowid
+            else:
+                cur.execute("UPDATE chapter_notes SET text=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
+                            (txt, self._note_row_id))
         self._notes_dirty = False
 
@@ -219,8 +219,9 @@ class CharacterDialog(QDialog):
 
         if a_type and alias and a_type != "Add alias…":
             # Same order used everywhere: (alias, alias_type)
-            self.db.alias_type_upsert(self.app._current_project_id, a_type)
-            self.db.alias_add(self.character_id, alias, a_type)
+            with self.db.transaction():
+                self.db.alias_type_upsert(self.app._current_project_id, a_type)
+                self.db.alias_add(self.character_id, alias, a_type)
 
             # reset UI add-row
             if alias_item:
@@ -322,8 +323,9 @@ class CharacterDialog(QDialog):
             self._reload_alias_table()
 
             # facets
-            phys = self.app.db.character_facets_by_type(character_id, "trait_physical")   # [{id,label,value,note}]
-            char = self.app.db.character_facets_by_type(character_id, "trait_character")
+            facets = self.app.db.character_facets_grouped(character_id)   # {facet_type: [{id,label,value,note}]}
+            phys = facets["trait_physical"]
+            char = facets["trait_character"]
             self.tblPhysical.set_rows(phys) #;  fit_table_height_to_rows(self.tblPhysical._table, min_rows=1)
             self.tblCharacter.set_rows(char) #; fit_table_height_to_rows(self.tblCharacter._table, min_rows=1)
         finally:
@@ -439,8 +441,9 @@ class CharacterDialog(QDialog):
         # 3) (your other saves: name, description, facets, etc.)
         title = self.nameEdit.text().strip()
         md    = self.descEdit.toPlainText()
-        self.app.db.world_item_update(self._id, title=title, content_md=md)
-        self.app.rebuild_world_item_render(self._id) # render html from md # TODO: Should this not happen until loading world item?
+        with self.app.db.transaction():
+            self.app.db.world_item_update(self._id, title=title, content_md=md)
+            self.app.rebuild_world_item_render(self._id) # render html from md # TODO: Should this not happen until loading world item?
         # # aliases: iterate table and upsert # NOTE: This might already be done in _alias_edited
         # self._persist_aliases()
 
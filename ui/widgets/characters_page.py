@@ -142,10 +142,6 @@ class CharactersPage(QWidget):
         pid = self._project_id
         if not pid: return
         # simple: create empty and open editor
-        c = self.db.conn.cursor()
-        c.execute("""INSERT INTO world_items(project_id, type, title, content_md, content_render)
-                     VALUES(?, 'character', 'New Character', '', '')""", (pid,))
-        self.db.conn.commit()
-        new_id = int(c.lastrowid)
+        new_id = self.db.world_item_insert(pid, title="New Character", item_type="character")
         self.characterOpenRequested.emit(new_id)
         self.refresh()
@@ -168,11 +168,7 @@ class ProjectManagerDialog(QDialog):
         imprt = self.importEdit.text().strip() or None
         exprt = self.exportEdit.text().strip() or None
         desc  = self.descEdit.toPlainText().strip() or None
-        c = self.app.db.conn.cursor()
-        c.execute("""UPDATE projects
-                     SET name=?, import_dir=?, export_dir=?, description=?, deleted=COALESCE(deleted,0)
-                     WHERE id=?""", (name, imprt, exprt, desc, pid))
-        self.app.db.conn.commit()
+        self.app.db.project_set_meta(pid, name=name, import_dir=imprt, export_dir=exprt, description=desc)
         # Update list display text
         it = self.list.currentItem()
         if it: it.setText(name)
@@ -183,9 +179,7 @@ class ProjectManagerDialog(QDialog):
     def _new_project(self):
         name, ok = QInputDialog.getText(self, "Untitled Project", "Project name:")
         if not ok or not name.strip(): return
-        c = self.app.db.conn.cursor()
-        c.execute("INSERT INTO projects(name) VALUES(?)", (name.strip(),))
-        self.app.db.conn.commit()
+        self.app.db.project_create(name.strip())
         self._load_projects()
         # select the new one
         for i in range(self.list.count()):
@@ -221,9 +215,7 @@ class ProjectManagerDialog(QDialog):
         old = item.text()
         new, ok = QInputDialog.getText(self, "Rename Project", "New name:", text=old)
         if not ok or not new.strip(): return
-        c = self.app.db.conn.cursor()
-        c.execute("UPDATE projects SET name=? WHERE id=?", (new.strip(), pid))
-        self.app.db.conn.commit()
+        self.app.db.project_update_meta(pid, name=new.strip())
         item.setText(new.strip())
         if pid == getattr(self.app, "_current_project_id", None):
             self.app.refresh_project_header()
@@ -258,10 +250,8 @@ class ProjectManagerDialog(QDialog):
                 QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if btn != QMessageBox.Yes:
                 return
-            c = self.app.db.conn.cursor()
-            c.execute("DELETE FROM projects WHERE id=?", (pid,))
             # cascade deletes not declared; dependent rows should not exist if empty
-            self.app.db.conn.commit()
+            self.app.db.project_delete(pid)
         else:
             # soft delete
             btn = QMessageBox.question(self, "Delete Project",
@@ -269,9 +259,7 @@ class ProjectManagerDialog(QDialog):
                 QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if btn != QMessageBox.Yes:
                 return
-            c = self.app.db.conn.cursor()
-            c.execute("UPDATE projects SET deleted=1 WHERE id=?", (pid,))
-            self.app.db.conn.commit()
+            self.app.db.project_soft_delete(pid)
 
         # If we deleted the current project, switch away
         if pid == getattr(self.app, "_current_project_id", None):
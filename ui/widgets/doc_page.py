@@ -286,10 +286,7 @@ class DocPage(QtWidgets.QWidget):
 
         # ---- Active version + markdown -------------------------------------
         # Prefer the chapter's configured active version; if missing, create/resolve one.
-        ver_id = db.get_active_version_id(chap_id)
-        if not ver_id:
-            # This helper lazily creates an active version row if needed.
-            ver_id = db.chapter_active_version_id(chap_id)
+        ver_id = db.ensure_active_version(chap_id)
 
         self._current_version_id = int(ver_id) if ver_id is not None else None
 
@@ -362,7 +359,7 @@ class DocPage(QtWidgets.QWidget):
             if self._current_version_id:
                 ver_id = int(self._current_version_id)
             else:
-                ver_id = db.get_active_version_id(chap_id) or db.chapter_active_version_id(chap_id)
+                ver_id = db.ensure_active_version(chap_id)
 
         if not ver_id:
             # If this ever triggers, we have a schema/logic issue and should fix it explicitly.
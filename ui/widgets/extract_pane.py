@@ -276,8 +276,9 @@ class ExtractPane(QWidget):
         return "alias" if rb_alias.isChecked() else "create"
 
     def on_reject_selected(self):
-        for cand_id in self._selected_ids():
-            self.mw.reject_candidate(cand_id, rerender=False)
+        with self.mw.db.transaction():
+            for cand_id in self._selected_ids():
+                self.mw.reject_candidate(cand_id, rerender=False)
         self.mw.rerender_center_and_extract()
 
     def on_double_clicked(self, index):
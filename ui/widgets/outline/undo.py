@@ -445,9 +445,10 @@ class UnifiedUndoController(QtCore.QObject):
         if undo:
 
             # resurrect
-            db.chapter_undelete(cid)
-            # db.chapter_update(cid, title=payload["title"], content_md=payload["content_md"])
-            db.chapter_move_to_index(pid, bid, cid, pos)
+            with db.transaction():
+                db.chapter_undelete(cid)
+                # db.chapter_update(cid, title=payload["title"], content_md=payload["content_md"])
+                db.chapter_move_to_index(pid, bid, cid, pos)
             self.page.workspace.load_from_db(db, pid, bid, focus=(cid, (ln, col)))
             print("Chapter undeleted")
 
@@ -469,9 +470,10 @@ class UnifiedUndoController(QtCore.QObject):
             # Persist active version name and flush lines before removing
             if active_v:
                 self.page.set_current_outline_version_name_for(cid, active_v)
-            db.chapter_soft_delete(cid)
-            # renumber remaining in that book
-            db.chapter_compact_positions(pid, bid)
+            with db.transaction():
+                db.chapter_soft_delete(cid)
+                # renumber remaining in that book
+                db.chapter_compact_positions(pid, bid)
             self.page.close_panes_for_deleted_chapter(cid)
             ws.load_from_db(db, pid, bid, focus=(neighbor_cid, (0,0)))
             self.page._after_apply_for_editor(None)  # let your hook clear mini if needed
@@ -165,6 +165,7 @@ class ThemeManager:
         self._base_pt = 10.0
         self._scale = 1.0  # 1.0 = 100%
         self._extra_qss = ""
+        self._qss_cache: Dict[tuple, str] = {}  # (theme idx, scale) -> formatted QSS
 
     @property
     def current(self) -> Theme:
@@ -200,7 +201,8 @@ class ThemeManager:
         if base_pt is not None:
             self.set_base_pt(base_pt)
 
-        app.setStyle("Fusion")
+        if app.style().name().lower() != "fusion":
+            app.setStyle("Fusion")
 
         # ---- Palette ----
         pal = QPalette()
@@ -219,15 +221,29 @@ class ThemeManager:
         pal.setColor(QPalette.Disabled, QPalette.Text, QColor(theme.disabled_text))
         pal.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(theme.disabled_text))
         pal.setColor(QPalette.Disabled, QPalette.WindowText, QColor(theme.disabled_text))
-        app.setPalette(pal)
+        if app.palette() != pal:
+            app.setPalette(pal)
 
         # ---- Font baseline ----
         f = app.font() if app.font() else QFont()
         if font_family:
             f.setFamily(font_family)
         f.setPointSizeF(self._base_pt)
-        app.setFont(f)
+        if app.font() != f:
+            app.setFont(f)
 
+        # ---- Stylesheet (formatted once per theme/scale) ----
+        key = (self._idx, self._scale)
+        qss = self._qss_cache.get(key)
+        if qss is None:
+            qss = self._qss_cache[key] = self._build_qss(theme)
+        # self.append_global_qss(WIKILINK_QSS)
+        # app.setStyleSheet(qss + self._extra_qss)
+        # Re-setting an identical stylesheet still repolishes every widget; skip it.
+        if app.styleSheet() != qss:
+            app.setStyleSheet(qss)
+
+    def _build_qss(self, theme: Theme) -> str:
         # ---- Sizing tokens derived from scale ----
         s = self._scale
         nums: Dict[str, int] = {
@@ -244,7 +260,7 @@ class ThemeManager:
             "check_radius": int(round(4 * s)),
         }
 
-        qss = QSS_TEMPLATE.format(
+        return QSS_TEMPLATE.format(
             tooltip_bg=theme.tooltip_bg, tooltip_fg=theme.tooltip_fg,
             base=theme.base, text=theme.text, window=theme.window, alt_base=theme.alt_base,
             highlight=theme.highlight, highlighted_text=theme.highlighted_text,
@@ -254,9 +270,6 @@ class ThemeManager:
             accent_ok=theme.accent_ok, accent_warn=theme.accent_warn, accent_err=theme.accent_err,
             **nums
         )
-        # self.append_global_qss(WIKILINK_QSS)
-        # app.setStyleSheet(qss + self._extra_qss)
-        app.setStyleSheet(qss)
 
 # Singleton-ish helper
 theme_manager = ThemeManager()
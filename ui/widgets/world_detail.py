@@ -264,7 +264,7 @@ class WorldDetailWidget(QWidget):
             self.statusLine.show_neutral("Viewing")
             return
 
-        item_type = self.app.db.world_item_meta(self._current_world_item_id)["type"]
+        item_type = self.app.db.world_item_title_and_type(self._current_world_item_id)["type"]
         if item_type == "character":
             # summary-only here; editing characters via dialog
             self.modeBtn.setText("Edit")
@@ -519,7 +519,7 @@ class WorldDetailWidget(QWidget):
         print("WorldDetailWidget.toggle_mode()")
         if not self._current_world_item_id:
             return
-        meta = self.app.db.world_item_meta(self._current_world_item_id)
+        meta = self.app.db.world_item_title_and_type(self._current_world_item_id)
         wtype = (meta["type"] or "")
         if wtype == "character":
             # open character dialog and refresh panel afterwards
@@ -814,8 +814,10 @@ class WorldDetailWidget(QWidget):
         self.contentBox.addWidget(desc)
 
         # Traits (two groups)
+        facets = self.app.db.character_facets_grouped(char_id)
+
         def add_traits(kind: str, title_text: str):
-            rows = self.app.db.character_facets_by_type(char_id, kind)
+            rows = facets[kind]
             if not rows:
                 return
             self._add_label(self.contentBox, f"<b>{title_text}</b>", set_size_policy=False)